@@ -464,11 +464,12 @@ class APIServer:
         def get_conversation():
             """Get conversation history"""
             try:
-                memory_file = Path('./memory/conversation_memory.json')
-                if memory_file.exists():
-                    with open(memory_file, 'r') as f:
-                        history = json.load(f)
-                    return jsonify(history)
+                state_file = Path('./memory/state.json')
+                if state_file.exists():
+                    with open(state_file, 'r') as f:
+                        state = json.load(f)
+                    state.pop('preferences', None)
+                    return jsonify(state)
                 return jsonify([])
             except Exception as e:
                 logger.error(f"Error getting conversation: {e}")
@@ -483,10 +484,13 @@ class APIServer:
                     return jsonify({'success': True, 'message': result})
 
                 # Fallback: clear manually
-                memory_file = Path('./memory/conversation_memory.json')
-                if memory_file.exists():
-                    with open(memory_file, 'w') as f:
-                        json.dump([], f)
+                state_file = Path('./memory/state.json')
+                if state_file.exists():
+                    with open(state_file, 'r') as f:
+                        state = json.load(f)
+                    state['history'] = []
+                    with open(state_file, 'w') as f:
+                        json.dump(state, f)
                     return jsonify({'success': True, 'message': 'Conversation history cleared'})
 
                 return jsonify({'success': True, 'message': 'No history to clear'})
@@ -7,10 +7,15 @@ import os
 import json
 import logging
 import base64
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from anthropic import Anthropic
-from openai import OpenAI
 from assistant.productivity_manager import ProductivityManager
 from assistant.smart_home_manager import SmartHomeManager
 from assistant.info_manager import InfoManager
@@ -23,9 +28,117 @@ from assistant.translation_manager import TranslationManager
 from assistant.fitness_manager import FitnessManager
 from assistant.games_manager import GamesManager
 from assistant.security_manager import SecurityManager
+from assistant.json_files import dump_json, load_json_file, write_atomic
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before writing assistant state to disk, so a burst of
+# turns results in one write
+STATE_SAVE_DELAY = 5
+
+# Read-only tools whose results are reused for TOOL_CACHE_TTL seconds. Any
+# other tool call may change what these report, so it empties the cache.
+# Only data that nothing but the assistant's own tools can change belongs
+# here: notes and todos are also edited through the API server, contacts
+# from the phone, and volume and device state outside the glasses.
+_CACHEABLE_TOOLS = frozenset({
+    'get_privacy_status', 'get_current_location', 'read_shopping_list',
+})
+TOOL_CACHE_TTL = 5
+
+# Lookup tools with no side effects. When a response asks for several of
+# these at once they run concurrently; anything else runs in order.
+_PARALLEL_SAFE_TOOLS = frozenset({
+    'get_time', 'recall_preference', 'bluetooth_status',
+    'read_notes', 'read_shopping_list', 'read_todos', 'check_device_status',
+    'get_weather', 'get_forecast', 'get_news', 'morning_briefing', 'search_wikipedia', 'define_word',
+    'convert_units', 'convert_currency',
+    'search_song', 'search_all_music', 'search_artist', 'search_album', 'search_podcast', 'get_volume',
+    'get_current_location', 'get_directions', 'find_nearby_places', 'get_distance_between', 'search_place',
+    'get_contact', 'list_contacts',
+    'calculate', 'calculate_age', 'days_until', 'tip_calculator',
+    'translate_text', 'detect_language',
+    'get_trivia', 'get_quote', 'tell_joke', 'get_riddle',
+    'get_privacy_status',
+})
+
+# Simple commands answered locally without an API round trip. Each group name
+# is the tool to run; the union must match the whole utterance so anything
+# more nuanced still goes to the model.
+_FAST_PATH_PATTERNS = (
+    ('flip_coin', r"(?:flip|toss) a coin"),
+    ('roll_dice', r"roll (?:a|the) (?:die|dice)"),
+    ('get_time', r"what time is it|what(?:'s| is) the time"),
+    ('read_notes', r"read (?:me )?my notes"),
+    ('read_shopping_list', r"read (?:me )?my shopping list|what'?s on my shopping list"),
+    ('read_todos', r"read (?:me )?my (?:todos|to-dos|todo list|to-do list)"),
+)
+_FAST_PATH_RE = re.compile(
+    r"\s*(?:please\s+)?(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _FAST_PATH_PATTERNS)
+    + r")(?:\s+please)?[\s.!?]*",
+    re.IGNORECASE
+)
+
+# Phrases that route an OpenAI request straight to the camera
+_VISION_KEYWORDS = ('what am i looking at', 'what do you see', 'describe what',
+                    'read this', 'what does this say', 'what is this object',
+                    'what is this', 'identify this')
+_VISION_RE = re.compile("|".join(map(re.escape, _VISION_KEYWORDS)), re.IGNORECASE)
+
+# Leading bytes of the image formats the vision APIs accept
+_IMAGE_MAGIC = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+_EXT_MIME = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+
+def _sniff_image_type(header):
+    """Return the MIME type for an image header, or None if unrecognized"""
+    for magic, image_type in _IMAGE_MAGIC:
+        if header.startswith(magic):
+            return image_type
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+@lru_cache(maxsize=4)
+def _encode_image(image_path, mtime_ns, size):
+    """Read and base64-encode an image. Cached on (path, mtime, size) so
+    back-to-back vision queries on the same photo skip the disk read and
+    re-encode; the cache is kept small since entries are whole images."""
+    with open(image_path, 'rb') as image_file:
+        raw = image_file.read()
+    # The SDKs take base64 data as str; base64 is pure ASCII, so skip the
+    # UTF-8 decoder. The cache means this str is built once per photo.
+    image_data = base64.standard_b64encode(raw).decode('ascii')
+
+    # Determine image type from the file's magic bytes, then its name
+    image_type = _sniff_image_type(raw[:12])
+    if image_type is None:
+        image_type = _EXT_MIME.get(Path(image_path).suffix.lower(), 'image/jpeg')
+
+    return image_data, image_type
+
+
+@lru_cache(maxsize=4)
+def _encode_image_data_url(image_path, mtime_ns, size):
+    """Build the data: URL for an image once per file version, so repeat
+    OpenAI vision calls don't copy the whole base64 payload again"""
+    image_data, image_type = _encode_image(image_path, mtime_ns, size)
+    return f"data:{image_type};base64,{image_data}"
+
 
 class AIAssistant:
     """AI assistant for processing voice commands and queries"""
@@ -50,12 +163,8 @@ class AIAssistant:
         if not self.api_key:
             logger.warning(f"API key not found in environment variable: {api_key_env}")
 
-        # Initialize client
-        self.client = None
-        if self.provider == 'anthropic' and self.api_key:
-            self.client = Anthropic(api_key=self.api_key)
-        elif self.provider == 'openai' and self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+        # Provider client is created on first use (see the client property)
+        self._client = None
 
         # Tool managers
         self.camera_manager = camera_manager
@@ -65,8 +174,8 @@ class AIAssistant:
         # Productivity manager (will be initialized after memory_dir is set)
         self.productivity_manager = None
 
-        # Memory
-        self.conversation_history = []
+        # Memory (bounded to the last 20 messages)
+        self.conversation_history = deque(maxlen=20)
         self.user_preferences = {}
         self.session_context = {
             'session_start': datetime.now().isoformat(),
@@ -77,6 +186,14 @@ class AIAssistant:
         # Memory persistence
         self.memory_dir = Path(config.get('memory_directory', './memory'))
         self.memory_dir.mkdir(exist_ok=True)
+        self.state_file = self.memory_dir / 'state.json'
+        self._state_lock = threading.Lock()
+        self._state_dirty = False
+        self._state_timer = None
+        self._stamp_second = None
+        self._stamp_iso = None
+
+        # Pre-state.json files, migrated on first run
         self.memory_file = self.memory_dir / 'conversation_memory.json'
         self.preferences_file = self.memory_dir / 'user_preferences.json'
 
@@ -122,12 +239,16 @@ class AIAssistant:
         # Initialize security manager
         self.security_manager = SecurityManager(memory_dir=str(self.memory_dir))
 
+        # Tool name -> handler table
+        self._tool_dispatch = self._build_tool_dispatch()
+        self._tool_cache = {}
+        self._tool_pool = ThreadPoolExecutor(max_workers=4)
+
         # Load persistent memory
-        self._load_memory()
-        self._load_preferences()
+        self._load_state()
 
         # System prompt
-        self.system_prompt = self._build_system_prompt()
+        self._refresh_system_prompt()
 
         # Initialize tools
         if self.use_tools:
@@ -135,6 +256,37 @@ class AIAssistant:
 
         logger.info(f"AI Assistant initialized - provider: {self.provider}, model: {self.model}, personality: {self.personality}")
 
+    @property
+    def client(self):
+        """Provider SDK client, imported and created on first use so only the
+        configured provider's SDK is ever loaded"""
+        if self._client is None and self.api_key:
+            try:
+                if self.provider == 'anthropic':
+                    from anthropic import Anthropic
+                    self._client = Anthropic(api_key=self.api_key)
+                elif self.provider == 'openai':
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key)
+            except ImportError as e:
+                logger.error(f"AI provider SDK not installed: {e}")
+        return self._client
+
+    def _refresh_system_prompt(self):
+        """Rebuild the system prompt and the per-provider message forms sent with every request"""
+        self.system_prompt = self._build_system_prompt()
+
+        # OpenAI: reusable system message at the head of each request
+        self._system_msg = {"role": "system", "content": self.system_prompt}
+
+        # Anthropic: mark the system prompt (and the tools ahead of it) as a
+        # prompt-cache breakpoint so the stable prefix isn't reprocessed each turn
+        self._system_blocks = [{
+            "type": "text",
+            "text": self.system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+
     def _build_system_prompt(self):
         """Build system prompt based on personality and context"""
 
@@ -610,6 +762,25 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                     "required": []
                 }
             },
+            {
+                "name": "morning_briefing",
+                "description": "Get a briefing with current weather, the forecast and top headlines in one go. Use when user asks for 'my briefing', 'morning update', 'what's happening today', etc.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "location": {
+                            "type": "string",
+                            "description": "City name or location (optional, uses default if not provided)"
+                        },
+                        "topics": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "News topics to include (optional, general headlines if not provided)"
+                        }
+                    },
+                    "required": []
+                }
+            },
             {
                 "name": "search_wikipedia",
                 "description": "Search Wikipedia for information. Use when user asks 'who is', 'what is', 'tell me about', etc.",
@@ -697,6 +868,20 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                     "required": ["query"]
                 }
             },
+            {
+                "name": "search_all_music",
+                "description": "Search iTunes, Spotify and YouTube for a song at the same time. Use when user asks to 'search everywhere for X', 'find X on all services', etc.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Song name or search query"
+                        }
+                    },
+                    "required": ["query"]
+                }
+            },
             {
                 "name": "search_artist",
                 "description": "Search for an artist and their songs. Use when user asks 'songs by X', 'artist X', etc.",
@@ -1216,12 +1401,24 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
             }
         ]
 
+        # Drop empty "properties"/"required" stubs - the tool list is re-sent
+        # with every request, so the boilerplate costs tokens on each turn
+        for tool in self.tools_available:
+            schema = tool['input_schema']
+            for key in ('properties', 'required'):
+                if not schema.get(key):
+                    schema.pop(key, None)
+
         logger.info(f"Initialized {len(self.tools_available)} tools for AI assistant")
 
     def process(self, user_input):
         """
         Process user input and return AI response
         """
+        fast_match = _FAST_PATH_RE.fullmatch(user_input)
+        if fast_match:
+            return self._process_fast_path(user_input, fast_match.lastgroup)
+
         if not self.client:
             logger.error("AI client not initialized - check API key")
             return "Sorry, I'm not properly configured. Please check the API key."
@@ -1239,7 +1436,7 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
             logger.info(f"Response: {response}")
 
             # Save memory periodically
-            self._save_memory()
+            self._save_state()
 
             return response
 
@@ -1247,6 +1444,17 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
             logger.error(f"Error processing with AI: {e}")
             return "Sorry, I encountered an error processing your request."
 
+    def _process_fast_path(self, user_input, tool_name):
+        """Answer a simple command by running its tool directly"""
+        logger.info(f"Fast path: {tool_name}")
+        response = str(self._execute_tool(tool_name, {}))
+
+        self._append_history("user", user_input)
+        self._append_history("assistant", response)
+
+        self._save_state()
+        return response
+
     def process_anthropic(self, user_input):
         """Process using Anthropic Claude API with tool calling support"""
         try:
@@ -1261,8 +1469,8 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                 "model": self.model,
                 "max_tokens": self.max_tokens,
                 "temperature": self.temperature,
-                "system": self.system_prompt,
-                "messages": self.conversation_history
+                "system": self._system_blocks,
+                "messages": list(self.conversation_history)
             }
 
             if self.use_tools and self.tools_available:
@@ -1270,507 +1478,338 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
 
             response = self.client.messages.create(**kwargs)
 
-            # Handle tool use if present
-            assistant_content = []
-            final_text = None
-
-            for content_block in response.content:
-                if content_block.type == "text":
-                    final_text = content_block.text
-                    assistant_content.append(content_block)
-
-                elif content_block.type == "tool_use":
-                    # Execute tool
-                    tool_result = self._execute_tool(
-                        content_block.name,
-                        content_block.input
-                    )
-
-                    # Add tool use to content
-                    assistant_content.append(content_block)
-
-                    # Add assistant message with tool use
-                    self.conversation_history.append({
-                        "role": "assistant",
-                        "content": assistant_content
-                    })
-
-                    # Add tool result
-                    self.conversation_history.append({
-                        "role": "user",
-                        "content": [{
-                            "type": "tool_result",
-                            "tool_use_id": content_block.id,
-                            "content": str(tool_result)
-                        }]
-                    })
-
-                    # Get final response after tool use
-                    final_response = self.client.messages.create(
-                        model=self.model,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        system=self.system_prompt,
-                        messages=self.conversation_history,
-                        tools=self.tools_available if self.use_tools else None
-                    )
-
-                    final_text = final_response.content[0].text
-                    assistant_content = [final_response.content[0]]
+            # Handle tool use if present - run every requested tool, then send
+            # all results back in a single follow-up request
+            tool_uses = [block for block in response.content if block.type == "tool_use"]
+            if tool_uses:
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": response.content
+                })
+
+                tool_results = self._run_tool_uses(tool_uses)
+                self.conversation_history.append({
+                    "role": "user",
+                    "content": [{
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": str(result)
+                    } for block, result in zip(tool_uses, tool_results)]
+                })
+
+                # Get final response after tool use
+                kwargs["messages"] = list(self.conversation_history)
+                response = self.client.messages.create(**kwargs)
+
+            text_blocks = [block for block in response.content if block.type == "text"]
+            final_text = text_blocks[-1].text if text_blocks else None
 
             # Add final assistant response to history
             if final_text:
                 self.conversation_history.append({
                     "role": "assistant",
-                    "content": assistant_content if assistant_content else final_text
+                    "content": text_blocks
                 })
 
-            # Keep history manageable (last 20 messages)
-            if len(self.conversation_history) > 20:
-                self.conversation_history = self.conversation_history[-20:]
-
             return final_text or "I completed the task."
 
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             raise
 
-    def _execute_tool(self, tool_name, tool_input):
-        """Execute a tool and return the result"""
-        logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
+    def _build_tool_dispatch(self):
+        """Build the tool name -> (handler, arg spec) table used by _execute_tool.
 
-        try:
-            if tool_name == "take_photo":
-                if self.camera_manager:
-                    photo_path = self.camera_manager.take_photo()
-                    return f"Photo captured and saved to {photo_path}"
-                else:
-                    return "Camera not available"
-
-            elif tool_name == "record_video":
-                if self.camera_manager:
-                    duration = tool_input.get('duration', 10)
-                    video_path = self.camera_manager.record_video(duration=duration)
-                    return f"Video recorded for {duration} seconds and saved to {video_path}"
-                else:
-                    return "Camera not available"
-
-            elif tool_name == "set_timer":
-                duration = tool_input.get('duration_seconds')
-                label = tool_input.get('label', 'Timer')
-                # TODO: Implement actual timer functionality
-                return f"Timer set for {duration} seconds ({duration/60:.1f} minutes) - {label}"
-
-            elif tool_name == "get_time":
-                now = datetime.now()
-                return now.strftime("Current time: %I:%M %p, %A, %B %d, %Y")
-
-            elif tool_name == "save_preference":
-                key = tool_input.get('key')
-                value = tool_input.get('value')
-                self.user_preferences[key] = value
-                self._save_preferences()
-                return f"Saved preference: {key} = {value}"
-
-            elif tool_name == "recall_preference":
-                key = tool_input.get('key')
-                value = self.user_preferences.get(key)
-                if value:
-                    return f"{key}: {value}"
-                else:
-                    return f"No preference found for {key}"
-
-            elif tool_name == "media_control":
-                if self.bluetooth_manager:
-                    action = tool_input.get('action')
-                    if action == 'play':
-                        self.bluetooth_manager.media_play()
-                        return "Playing music"
-                    elif action == 'pause':
-                        self.bluetooth_manager.media_pause()
-                        return "Music paused"
-                    elif action == 'next':
-                        self.bluetooth_manager.media_next()
-                        return "Skipping to next track"
-                    elif action == 'previous':
-                        self.bluetooth_manager.media_previous()
-                        return "Going to previous track"
-                    else:
-                        return f"Unknown media action: {action}"
-                else:
-                    return "Bluetooth not available"
-
-            elif tool_name == "answer_call":
-                if self.bluetooth_manager:
-                    self.bluetooth_manager.answer_call()
-                    return "Call answered"
-                else:
-                    return "Bluetooth not available"
-
-            elif tool_name == "end_call":
-                if self.bluetooth_manager:
-                    self.bluetooth_manager.end_call()
-                    return "Call ended"
-                else:
-                    return "Bluetooth not available"
-
-            elif tool_name == "bluetooth_status":
-                if self.bluetooth_manager:
-                    status = self.bluetooth_manager.get_status()
-                    if status['connected']:
-                        return f"Bluetooth connected to {status.get('connected_device', 'phone')}"
-                    else:
-                        return "Bluetooth not connected"
-                else:
-                    return "Bluetooth not available"
-
-            elif tool_name == "look_at":
-                if self.camera_manager:
-                    # Take a photo
-                    photo_path = self.camera_manager.take_photo()
-
-                    # Analyze with vision
-                    question = tool_input.get('question', 'What do you see in this image?')
-                    description = self._analyze_image_with_vision(photo_path, question)
-
-                    return description
-                else:
-                    return "Camera not available"
-
-            elif tool_name == "read_text":
-                if self.camera_manager:
-                    # Take a photo
-                    photo_path = self.camera_manager.take_photo()
-
-                    # Read text from image
-                    text = self._analyze_image_with_vision(
-                        photo_path,
-                        "Read all visible text in this image. If there's no text, say 'No text visible'."
-                    )
-
-                    return text
-                else:
-                    return "Camera not available"
-
-            elif tool_name == "identify_object":
-                if self.camera_manager:
-                    # Take a photo
-                    photo_path = self.camera_manager.take_photo()
-
-                    # Identify object
-                    identification = self._analyze_image_with_vision(
-                        photo_path,
-                        "What is the main object in this image? Identify it and provide relevant details."
-                    )
+        The arg spec lists (input key, default) pairs; the dispatcher pulls
+        them out of tool_input in order and passes them positionally.
+        Manager methods are bound once here, so a dispatch is a dict lookup
+        plus a call.
+        """
+        productivity = self.productivity_manager
+        smart_home = self.smart_home_manager
+        info = self.info_manager
+        media = self.media_manager
+        navigation = self.navigation_manager
+        comms = self.communications_manager
+        quick = self.quick_tools_manager
+        vision = self.vision_manager
+        translation = self.translation_manager
+        fitness = self.fitness_manager
+        games = self.games_manager
+        security = self.security_manager
+        analyze = self._analyze_image_with_vision
 
-                    return identification
-                else:
-                    return "Camera not available"
+        return {
+            # Camera & vision
+            "take_photo": (self._camera_tool(self._tool_take_photo), ()),
+            "record_video": (self._camera_tool(self._tool_record_video), (('duration', 10),)),
+            "look_at": (self._camera_tool(self._tool_look_at), (('question', 'What do you see in this image?'),)),
+            "read_text": (self._camera_tool(self._tool_read_text), ()),
+            "identify_object": (self._camera_tool(self._tool_identify_object), ()),
+
+            # Core tools
+            "set_timer": (self._tool_set_timer, (('duration_seconds', None), ('label', 'Timer'))),
+            "get_time": (self._tool_get_time, ()),
+            "save_preference": (self._tool_save_preference, (('key', None), ('value', None))),
+            "recall_preference": (self._tool_recall_preference, (('key', None),)),
+
+            # Bluetooth tools
+            "media_control": (self._bluetooth_tool(self._tool_media_control), (('action', None),)),
+            "answer_call": (self._bluetooth_tool(self._tool_answer_call), ()),
+            "end_call": (self._bluetooth_tool(self._tool_end_call), ()),
+            "bluetooth_status": (self._bluetooth_tool(self._tool_bluetooth_status), ()),
 
             # Productivity tools
-            elif tool_name == "take_note":
-                note = tool_input.get('note')
-                return self.productivity_manager.add_note(note)
-
-            elif tool_name == "set_reminder":
-                task = tool_input.get('task')
-                time = tool_input.get('time')
-                return self.productivity_manager.add_reminder(task, time)
-
-            elif tool_name == "add_to_shopping_list":
-                items = tool_input.get('items')
-                return self.productivity_manager.add_to_shopping_list(items)
-
-            elif tool_name == "add_todo":
-                task = tool_input.get('task')
-                priority = tool_input.get('priority', 'medium')
-                return self.productivity_manager.add_todo(task, priority)
-
-            elif tool_name == "read_notes":
-                return self.productivity_manager.get_notes()
-
-            elif tool_name == "read_shopping_list":
-                return self.productivity_manager.get_shopping_list()
-
-            elif tool_name == "read_todos":
-                return self.productivity_manager.get_todos()
+            "take_note": (productivity.add_note, (('note', None),)),
+            "set_reminder": (productivity.add_reminder, (('task', None), ('time', None))),
+            "add_to_shopping_list": (productivity.add_to_shopping_list, (('items', None),)),
+            "add_todo": (productivity.add_todo, (('task', None), ('priority', 'medium'))),
+            "read_notes": (productivity.get_notes, ()),
+            "read_shopping_list": (productivity.get_shopping_list, ()),
+            "read_todos": (productivity.get_todos, ()),
 
             # Smart Home tools
-            elif tool_name == "turn_on_device":
-                device = tool_input.get('device')
-                return self.smart_home_manager.turn_on_device(device)
-
-            elif tool_name == "turn_off_device":
-                device = tool_input.get('device')
-                return self.smart_home_manager.turn_off_device(device)
-
-            elif tool_name == "set_brightness":
-                device = tool_input.get('device')
-                brightness = tool_input.get('brightness')
-                return self.smart_home_manager.set_brightness(device, brightness)
-
-            elif tool_name == "set_temperature":
-                device = tool_input.get('device')
-                temperature = tool_input.get('temperature')
-                return self.smart_home_manager.set_temperature(device, temperature)
-
-            elif tool_name == "activate_scene":
-                scene = tool_input.get('scene')
-                return self.smart_home_manager.activate_scene(scene)
-
-            elif tool_name == "check_device_status":
-                device = tool_input.get('device')
-                return self.smart_home_manager.get_device_state(device)
+            "turn_on_device": (smart_home.turn_on_device, (('device', None),)),
+            "turn_off_device": (smart_home.turn_off_device, (('device', None),)),
+            "set_brightness": (smart_home.set_brightness, (('device', None), ('brightness', None))),
+            "set_temperature": (smart_home.set_temperature, (('device', None), ('temperature', None))),
+            "activate_scene": (smart_home.activate_scene, (('scene', None),)),
+            "check_device_status": (smart_home.get_device_state, (('device', None),)),
 
             # Information & Lookup tools
-            elif tool_name == "get_weather":
-                location = tool_input.get('location')
-                return self.info_manager.get_weather(location)
-
-            elif tool_name == "get_forecast":
-                location = tool_input.get('location')
-                days = tool_input.get('days', 3)
-                return self.info_manager.get_forecast(location, days)
-
-            elif tool_name == "get_news":
-                topic = tool_input.get('topic')
-                count = tool_input.get('count', 3)
-                return self.info_manager.get_news(topic, count)
-
-            elif tool_name == "search_wikipedia":
-                query = tool_input.get('query')
-                return self.info_manager.search_wikipedia(query)
-
-            elif tool_name == "define_word":
-                word = tool_input.get('word')
-                return self.info_manager.define_word(word)
-
-            elif tool_name == "convert_units":
-                value = tool_input.get('value')
-                from_unit = tool_input.get('from_unit')
-                to_unit = tool_input.get('to_unit')
-                return self.info_manager.convert_units(value, from_unit, to_unit)
-
-            elif tool_name == "convert_currency":
-                amount = tool_input.get('amount')
-                from_currency = tool_input.get('from_currency')
-                to_currency = tool_input.get('to_currency')
-                return self.info_manager.convert_currency(amount, from_currency, to_currency)
+            "get_weather": (info.get_weather, (('location', None),)),
+            "get_forecast": (info.get_forecast, (('location', None), ('days', 3))),
+            "get_news": (info.get_news, (('topic', None), ('count', 3))),
+            "morning_briefing": (info.morning_briefing, (('location', None), ('topics', None))),
+            "search_wikipedia": (info.search_wikipedia, (('query', None),)),
+            "define_word": (info.define_word, (('word', None),)),
+            "convert_units": (info.convert_units, (('value', None), ('from_unit', None), ('to_unit', None))),
+            "convert_currency": (info.convert_currency, (('amount', None), ('from_currency', None), ('to_currency', None))),
 
             # Enhanced Media tools
-            elif tool_name == "search_song":
-                query = tool_input.get('query')
-                return self.media_manager.search_song(query)
-
-            elif tool_name == "search_artist":
-                artist = tool_input.get('artist')
-                return self.media_manager.search_artist(artist)
-
-            elif tool_name == "search_album":
-                album = tool_input.get('album')
-                return self.media_manager.search_album(album)
-
-            elif tool_name == "search_podcast":
-                query = tool_input.get('query')
-                return self.media_manager.search_podcast(query)
-
-            elif tool_name == "set_volume":
-                level = tool_input.get('level')
-                return self.media_manager.set_volume(level)
-
-            elif tool_name == "get_volume":
-                return self.media_manager.get_volume()
-
-            elif tool_name == "volume_up":
-                amount = tool_input.get('amount', 10)
-                return self.media_manager.volume_up(amount)
-
-            elif tool_name == "volume_down":
-                amount = tool_input.get('amount', 10)
-                return self.media_manager.volume_down(amount)
-
-            elif tool_name == "mute_audio":
-                return self.media_manager.mute_audio()
-
-            elif tool_name == "unmute_audio":
-                return self.media_manager.unmute_audio()
+            "search_song": (media.search_song, (('query', None),)),
+            "search_all_music": (media.search_all, (('query', None),)),
+            "search_artist": (media.search_artist, (('artist', None),)),
+            "search_album": (media.search_album, (('album', None),)),
+            "search_podcast": (media.search_podcast, (('query', None),)),
+            "set_volume": (media.set_volume, (('level', None),)),
+            "get_volume": (media.get_volume, ()),
+            "volume_up": (media.volume_up, (('amount', 10),)),
+            "volume_down": (media.volume_down, (('amount', 10),)),
+            "mute_audio": (media.mute_audio, ()),
+            "unmute_audio": (media.unmute_audio, ()),
 
             # Navigation & Location tools
-            elif tool_name == "get_current_location":
-                return self.navigation_manager.get_current_location()
-
-            elif tool_name == "get_directions":
-                origin = tool_input.get('origin')
-                destination = tool_input.get('destination')
-                return self.navigation_manager.get_directions(origin, destination)
-
-            elif tool_name == "find_nearby_places":
-                location = tool_input.get('location')
-                place_type = tool_input.get('place_type')
-                return self.navigation_manager.find_nearby_places(location, place_type)
-
-            elif tool_name == "get_distance_between":
-                location1 = tool_input.get('location1')
-                location2 = tool_input.get('location2')
-                return self.navigation_manager.get_distance_between(location1, location2)
-
-            elif tool_name == "search_place":
-                query = tool_input.get('query')
-                return self.navigation_manager.search_place(query)
+            "get_current_location": (navigation.get_current_location, ()),
+            "get_directions": (navigation.get_directions, (('origin', None), ('destination', None))),
+            "find_nearby_places": (navigation.find_nearby_places, (('location', None), ('place_type', None))),
+            "get_distance_between": (navigation.get_distance_between, (('location1', None), ('location2', None))),
+            "search_place": (navigation.search_place, (('query', None),)),
 
             # Communications tools
-            elif tool_name == "add_contact":
-                name = tool_input.get('name')
-                phone = tool_input.get('phone')
-                email = tool_input.get('email')
-                return self.communications_manager.add_contact(name, phone, email)
-
-            elif tool_name == "get_contact":
-                name = tool_input.get('name')
-                return self.communications_manager.get_contact(name)
-
-            elif tool_name == "list_contacts":
-                return self.communications_manager.list_contacts()
-
-            elif tool_name == "call_contact":
-                name = tool_input.get('name')
-                return self.communications_manager.call_contact(name, self.bluetooth_manager)
-
-            elif tool_name == "dictate_message":
-                recipient = tool_input.get('recipient')
-                message = tool_input.get('message')
-                return self.communications_manager.dictate_message(recipient, message)
-
-            elif tool_name == "compose_email":
-                recipient = tool_input.get('recipient')
-                subject = tool_input.get('subject')
-                body = tool_input.get('body')
-                return self.communications_manager.compose_email(recipient, subject, body)
+            "add_contact": (comms.add_contact, (('name', None), ('phone', None), ('email', None))),
+            "get_contact": (comms.get_contact, (('name', None),)),
+            "list_contacts": (comms.list_contacts, ()),
+            "call_contact": (lambda name: comms.call_contact(name, self.bluetooth_manager), (('name', None),)),
+            "dictate_message": (comms.dictate_message, (('recipient', None), ('message', None))),
+            "compose_email": (comms.compose_email, (('recipient', None), ('subject', None), ('body', None))),
 
             # Quick Tools
-            elif tool_name == "calculate":
-                expression = tool_input.get('expression')
-                return self.quick_tools_manager.calculate(expression)
-
-            elif tool_name == "calculate_age":
-                birthdate = tool_input.get('birthdate')
-                return self.quick_tools_manager.calculate_age(birthdate)
-
-            elif tool_name == "days_until":
-                date = tool_input.get('date')
-                return self.quick_tools_manager.days_until(date)
-
-            elif tool_name == "flip_coin":
-                return self.quick_tools_manager.flip_coin()
-
-            elif tool_name == "roll_dice":
-                sides = tool_input.get('sides', 6)
-                count = tool_input.get('count', 1)
-                return self.quick_tools_manager.roll_dice(sides, count)
-
-            elif tool_name == "random_number":
-                min_val = tool_input.get('min', 1)
-                max_val = tool_input.get('max', 100)
-                return self.quick_tools_manager.random_number(min_val, max_val)
-
-            elif tool_name == "tip_calculator":
-                bill = tool_input.get('bill')
-                tip_percent = tool_input.get('tip_percent', 20)
-                return self.quick_tools_manager.tip_calculator(bill, tip_percent)
+            "calculate": (quick.calculate, (('expression', None),)),
+            "calculate_age": (quick.calculate_age, (('birthdate', None),)),
+            "days_until": (quick.days_until, (('date', None),)),
+            "flip_coin": (quick.flip_coin, ()),
+            "roll_dice": (quick.roll_dice, (('sides', 6), ('count', 1))),
+            "random_number": (quick.random_number, (('min', 1), ('max', 100))),
+            "tip_calculator": (quick.tip_calculator, (('bill', None), ('tip_percent', 20))),
 
             # Enhanced Vision tools
-            elif tool_name == "scan_barcode":
-                return self.vision_manager.scan_barcode()
-
-            elif tool_name == "read_nutrition_label":
-                return self.vision_manager.read_nutrition_label(self._analyze_image_with_vision)
-
-            elif tool_name == "detect_colors":
-                return self.vision_manager.detect_colors(self._analyze_image_with_vision)
-
-            elif tool_name == "count_objects":
-                return self.vision_manager.detect_objects(self._analyze_image_with_vision)
+            "scan_barcode": (vision.scan_barcode, ()),
+            "read_nutrition_label": (lambda: vision.read_nutrition_label(analyze), ()),
+            "detect_colors": (lambda: vision.detect_colors(analyze), ()),
+            "count_objects": (lambda: vision.detect_objects(analyze), ()),
 
             # Language & Translation tools
-            elif tool_name == "translate_text":
-                text = tool_input.get('text')
-                target_lang = tool_input.get('target_language')
-                source_lang = tool_input.get('source_language', 'auto')
-                return self.translation_manager.translate_text(text, target_lang, source_lang)
-
-            elif tool_name == "detect_language":
-                text = tool_input.get('text')
-                return self.translation_manager.detect_language(text)
-
-            elif tool_name == "translate_sign":
-                target_lang = tool_input.get('target_language')
-                return self.translation_manager.translate_sign(
-                    self._analyze_image_with_vision,
-                    target_lang,
-                    self.camera_manager
-                )
+            "translate_text": (translation.translate_text,
+                               (('text', None), ('target_language', None), ('source_language', 'auto'))),
+            "detect_language": (translation.detect_language, (('text', None),)),
+            "translate_sign": (lambda target_lang: translation.translate_sign(analyze, target_lang, self.camera_manager),
+                               (('target_language', None),)),
 
             # Fitness & Health tools
-            elif tool_name == "start_workout":
-                workout_type = tool_input.get('workout_type', 'workout')
-                return self.fitness_manager.start_workout(workout_type)
-
-            elif tool_name == "end_workout":
-                return self.fitness_manager.end_workout()
-
-            elif tool_name == "log_water":
-                ounces = tool_input.get('ounces')
-                return self.fitness_manager.log_water(ounces)
-
-            elif tool_name == "water_reminder":
-                return self.fitness_manager.water_reminder()
+            "start_workout": (fitness.start_workout, (('workout_type', 'workout'),)),
+            "end_workout": (fitness.end_workout, ()),
+            "log_water": (fitness.log_water, (('ounces', None),)),
+            "water_reminder": (fitness.water_reminder, ()),
 
             # Fun & Games tools
-            elif tool_name == "get_trivia":
-                return self.games_manager.get_trivia_question()
+            "get_trivia": (games.get_trivia_question, ()),
+            "get_quote": (games.get_quote, ()),
+            "tell_joke": (games.joke, ()),
+            "get_riddle": (games.riddle, ()),
 
-            elif tool_name == "get_quote":
-                return self.games_manager.get_quote()
+            # Security & Privacy tools
+            "clear_history": (security.clear_conversation_history, ()),
+            "enable_private_mode": (security.enable_private_mode, ()),
+            "get_privacy_status": (security.get_privacy_status, ()),
+        }
 
-            elif tool_name == "tell_joke":
-                return self.games_manager.joke()
+    def _camera_tool(self, handler):
+        """Wrap a tool handler so it only runs when the camera is available"""
+        def wrapper(*args):
+            if not self.camera_manager:
+                return "Camera not available"
+            return handler(*args)
+        return wrapper
+
+    def _bluetooth_tool(self, handler):
+        """Wrap a tool handler so it only runs when Bluetooth is available"""
+        def wrapper(*args):
+            if not self.bluetooth_manager:
+                return "Bluetooth not available"
+            return handler(*args)
+        return wrapper
+
+    def _run_tool_uses(self, tool_uses):
+        """Execute the tool_use blocks from one response.
+
+        Several side-effect-free lookups run concurrently on the tool pool;
+        otherwise tools run in the order requested.
+        """
+        if len(tool_uses) > 1 and all(block.name in _PARALLEL_SAFE_TOOLS for block in tool_uses):
+            return list(self._tool_pool.map(
+                lambda block: self._execute_tool(block.name, block.input),
+                tool_uses
+            ))
+        return [self._execute_tool(block.name, block.input) for block in tool_uses]
 
-            elif tool_name == "get_riddle":
-                return self.games_manager.riddle()
+    def _execute_tool(self, tool_name, tool_input):
+        """Execute a tool and return the result"""
+        logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
 
-            # Security & Privacy tools
-            elif tool_name == "clear_history":
-                return self.security_manager.clear_conversation_history()
+        # Tool names come back from the API as fresh strings; interning lets
+        # the dispatch/cache lookups below hit the identity fast path (the
+        # table's literal keys are already interned by the compiler)
+        if isinstance(tool_name, str):
+            tool_name = sys.intern(tool_name)
 
-            elif tool_name == "enable_private_mode":
-                return self.security_manager.enable_private_mode()
+        try:
+            entry = self._tool_dispatch.get(tool_name)
+            if entry is None:
+                return f"Unknown tool: {tool_name}"
+            handler, arg_spec = entry
+            args = [tool_input.get(name, default) for name, default in arg_spec]
 
-            elif tool_name == "get_privacy_status":
-                return self.security_manager.get_privacy_status()
+            if tool_name not in _CACHEABLE_TOOLS:
+                self._tool_cache.clear()
+                return handler(*args)
 
-            else:
-                return f"Unknown tool: {tool_name}"
+            key = (tool_name, *args)
+            cached = self._tool_cache.get(key)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+            result = handler(*args)
+            self._tool_cache[key] = (result, time.monotonic() + TOOL_CACHE_TTL)
+            return result
 
         except Exception as e:
             logger.error(f"Error executing tool {tool_name}: {e}")
             return f"Error executing {tool_name}: {str(e)}"
 
+    def _tool_take_photo(self):
+        photo_path = self.camera_manager.take_photo()
+        return f"Photo captured and saved to {photo_path}"
+
+    def _tool_record_video(self, duration):
+        video_path = self.camera_manager.record_video(duration=duration)
+        return f"Video recorded for {duration} seconds and saved to {video_path}"
+
+    def _tool_look_at(self, question):
+        # Take a photo and analyze it with vision
+        photo_path = self.camera_manager.take_photo()
+        return self._analyze_image_with_vision(photo_path, question)
+
+    def _tool_read_text(self):
+        photo_path = self.camera_manager.take_photo()
+        return self._analyze_image_with_vision(
+            photo_path,
+            "Read all visible text in this image. If there's no text, say 'No text visible'."
+        )
+
+    def _tool_identify_object(self):
+        photo_path = self.camera_manager.take_photo()
+        return self._analyze_image_with_vision(
+            photo_path,
+            "What is the main object in this image? Identify it and provide relevant details."
+        )
+
+    def _tool_set_timer(self, duration, label):
+        # TODO: Implement actual timer functionality
+        return f"Timer set for {duration} seconds ({duration/60:.1f} minutes) - {label}"
+
+    def _tool_get_time(self):
+        now = datetime.now()
+        return now.strftime("Current time: %I:%M %p, %A, %B %d, %Y")
+
+    def _tool_save_preference(self, key, value):
+        self.user_preferences[key] = value
+        self._save_state()
+        return f"Saved preference: {key} = {value}"
+
+    def _tool_recall_preference(self, key):
+        value = self.user_preferences.get(key)
+        if value:
+            return f"{key}: {value}"
+        else:
+            return f"No preference found for {key}"
+
+    def _tool_media_control(self, action):
+        if action == 'play':
+            self.bluetooth_manager.media_play()
+            return "Playing music"
+        elif action == 'pause':
+            self.bluetooth_manager.media_pause()
+            return "Music paused"
+        elif action == 'next':
+            self.bluetooth_manager.media_next()
+            return "Skipping to next track"
+        elif action == 'previous':
+            self.bluetooth_manager.media_previous()
+            return "Going to previous track"
+        else:
+            return f"Unknown media action: {action}"
+
+    def _tool_answer_call(self):
+        self.bluetooth_manager.answer_call()
+        return "Call answered"
+
+    def _tool_end_call(self):
+        self.bluetooth_manager.end_call()
+        return "Call ended"
+
+    def _tool_bluetooth_status(self):
+        status = self.bluetooth_manager.get_status()
+        if status['connected']:
+            return f"Bluetooth connected to {status.get('connected_device', 'phone')}"
+        else:
+            return "Bluetooth not connected"
+
     def _analyze_image_with_vision(self, image_path, question):
         """Analyze an image using Claude's vision capabilities"""
         try:
-            # Read and encode image
-            with open(image_path, 'rb') as image_file:
-                image_data = base64.standard_b64encode(image_file.read()).decode('utf-8')
-
-            # Determine image type
-            image_type = "image/jpeg"
-            if image_path.endswith('.png'):
-                image_type = "image/png"
+            # Read and encode image (cached per file version)
+            stat = os.stat(image_path)
+            image_key = (image_path, stat.st_mtime_ns, stat.st_size)
 
             logger.info(f"Analyzing image with vision: {question}")
 
             if self.provider == 'anthropic':
-                # Use Claude's vision API
+                image_data, image_type = _encode_image(*image_key)
+
+                # Use Claude's vision API. The request body is serialized by the
+                # SDK (httpx -> stdlib json, C-accelerated); for a single large
+                # base64 string that is a few ms, far below the upload itself,
+                # so it isn't worth bypassing the SDK to use orjson here.
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=1024,
@@ -1800,6 +1839,8 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                 return description
 
             elif self.provider == 'openai':
+                image_url = _encode_image_data_url(*image_key)
+
                 # Use GPT-4o Vision (new 1.0+ format)
                 response = self.client.chat.completions.create(
                     model=self.model,  # Use gpt-4o which has vision
@@ -1814,7 +1855,7 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                                 {
                                     "type": "image_url",
                                     "image_url": {
-                                        "url": f"data:{image_type};base64,{image_data}"
+                                        "url": image_url
                                     }
                                 }
                             ]
@@ -1838,11 +1879,7 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
         """Process using OpenAI GPT API with vision support"""
         try:
             # Check if this is a vision-related command
-            vision_keywords = ['what am i looking at', 'what do you see', 'describe what',
-                             'read this', 'what does this say', 'what is this object',
-                             'what is this', 'identify this']
-
-            is_vision_command = any(keyword in user_input.lower() for keyword in vision_keywords)
+            is_vision_command = bool(_VISION_RE.search(user_input))
 
             if is_vision_command and self.camera_manager:
                 # Handle vision commands directly
@@ -1850,9 +1887,10 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                 photo_path = self.camera_manager.take_photo()
 
                 # Determine the type of vision request
-                if 'read' in user_input.lower():
+                lowered = user_input.lower()
+                if 'read' in lowered:
                     question = "Read all visible text in this image. If there's no text, say 'No text visible'."
-                elif 'identify' in user_input.lower() or 'what is this' in user_input.lower():
+                elif 'identify' in lowered or 'what is this' in lowered:
                     question = "Identify the main object in this image and provide information about it."
                 else:
                     question = "Describe what you see in this image in detail."
@@ -1861,23 +1899,15 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
                 description = self._analyze_image_with_vision(photo_path, question)
 
                 # Update history
-                self.conversation_history.append({"role": "user", "content": user_input})
-                self.conversation_history.append({"role": "assistant", "content": description})
+                self._append_history("user", user_input)
+                self._append_history("assistant", description)
 
                 return description
 
-            # Regular text conversation
-            # Normalize conversation history to ensure all content is strings
-            normalized_history = []
-            for msg in self.conversation_history:
-                normalized_history.append({
-                    "role": msg["role"],
-                    "content": str(msg["content"])  # Ensure it's a string
-                })
-
+            # Regular text conversation (history content is always a string)
             messages = [
-                {"role": "system", "content": self.system_prompt}
-            ] + normalized_history + [
+                self._system_msg,
+                *self.conversation_history,
                 {"role": "user", "content": user_input}
             ]
 
@@ -1893,12 +1923,8 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
             assistant_message = response.choices[0].message.content
 
             # Update history
-            self.conversation_history.append({"role": "user", "content": user_input})
-            self.conversation_history.append({"role": "assistant", "content": assistant_message})
-
-            # Keep history manageable
-            if len(self.conversation_history) > 20:
-                self.conversation_history = self.conversation_history[-20:]
+            self._append_history("user", user_input)
+            self._append_history("assistant", assistant_message)
 
             return assistant_message
 
@@ -1906,58 +1932,93 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
             logger.error(f"OpenAI API error: {e}")
             raise
 
-    def _load_memory(self):
-        """Load conversation history from file"""
-        try:
-            if self.memory_file.exists():
-                with open(self.memory_file, 'r') as f:
-                    data = json.load(f)
-                    # Only load recent history (last session)
-                    self.conversation_history = data.get('history', [])[-10:]
-                    self.session_context.update(data.get('context', {}))
-                logger.info(f"Loaded {len(self.conversation_history)} messages from memory")
-        except Exception as e:
-            logger.error(f"Error loading memory: {e}")
-
-    def _save_memory(self):
-        """Save conversation history to file"""
-        try:
-            data = {
-                'history': self.conversation_history,
-                'context': self.session_context,
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.memory_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Error saving memory: {e}")
+    def _append_history(self, role, content):
+        """Append a plain-text message to history, coercing content to a string"""
+        self.conversation_history.append({
+            "role": role,
+            "content": content if isinstance(content, str) else str(content)
+        })
 
-    def _load_preferences(self):
-        """Load user preferences from file"""
+    def _load_state(self):
+        """Load conversation history, context and preferences from the state file"""
         try:
-            if self.preferences_file.exists():
-                with open(self.preferences_file, 'r') as f:
-                    self.user_preferences = json.load(f)
-                logger.info(f"Loaded {len(self.user_preferences)} user preferences")
+            if self.state_file.exists():
+                data = load_json_file(self.state_file)
+            else:
+                data = self._load_legacy_state()
+
+            # Only load recent history (last session)
+            self.conversation_history = deque(data.get('history', [])[-10:], maxlen=20)
+            if self.provider == 'openai':
+                # OpenAI messages must carry string content
+                for msg in self.conversation_history:
+                    if not isinstance(msg['content'], str):
+                        msg['content'] = str(msg['content'])
+            self.session_context.update(data.get('context', {}))
+            self.user_preferences = data.get('preferences', {})
+
+            logger.info(f"Loaded {len(self.conversation_history)} messages and "
+                        f"{len(self.user_preferences)} user preferences from memory")
         except Exception as e:
-            logger.error(f"Error loading preferences: {e}")
+            logger.error(f"Error loading memory: {e}")
 
-    def _save_preferences(self):
-        """Save user preferences to file"""
-        try:
-            with open(self.preferences_file, 'w') as f:
-                json.dump(self.user_preferences, f, indent=2)
-            logger.info("User preferences saved")
-        except Exception as e:
-            logger.error(f"Error saving preferences: {e}")
+    def _load_legacy_state(self):
+        """Read the separate memory/preferences files used before state.json"""
+        data = {}
+        if self.memory_file.exists():
+            data.update(load_json_file(self.memory_file))
+        if self.preferences_file.exists():
+            data['preferences'] = load_json_file(self.preferences_file)
+        if data:
+            logger.info("Migrating conversation memory and preferences to state.json")
+            self._state_dirty = True
+        return data
+
+    def _save_state(self):
+        """Mark assistant state as changed and schedule a write"""
+        with self._state_lock:
+            self._state_dirty = True
+            if self._state_timer is None:
+                self._state_timer = threading.Timer(STATE_SAVE_DELAY, self._flush_state)
+                self._state_timer.daemon = True
+                self._state_timer.start()
+
+    def _flush_state(self):
+        """Write history, context and preferences to the state file if changed"""
+        with self._state_lock:
+            if self._state_timer is not None:
+                self._state_timer.cancel()
+                self._state_timer = None
+            if not self._state_dirty:
+                return
+            self._state_dirty = False
+
+            try:
+                data = {
+                    'history': list(self.conversation_history),
+                    'context': dict(self.session_context),
+                    'preferences': dict(self.user_preferences),
+                    'last_updated': self._state_timestamp()
+                }
+                write_atomic(self.state_file, dump_json(data, default=str))
+            except Exception as e:
+                logger.error(f"Error saving memory: {e}")
+
+    def _state_timestamp(self):
+        """ISO timestamp for the state file, formatted at most once per second"""
+        now_second = int(time.time())
+        if now_second != self._stamp_second:
+            self._stamp_second = now_second
+            self._stamp_iso = datetime.fromtimestamp(now_second).isoformat()
+        return self._stamp_iso
 
     def set_user_name(self, name):
         """Set the user's name"""
         self.session_context['user_name'] = name
         self.user_preferences['name'] = name
-        self._save_preferences()
+        self._save_state()
         # Rebuild system prompt with new name
-        self.system_prompt = self._build_system_prompt()
+        self._refresh_system_prompt()
         logger.info(f"User name set to: {name}")
 
     def set_location(self, location):
@@ -1967,10 +2028,19 @@ Remember: You're worn on glasses, so you literally see what the user sees and ca
 
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
-        self._save_memory()
+        self.conversation_history.clear()
+        self._save_state()
+        self._flush_state()
         logger.info("Conversation history cleared")
 
+    def cleanup(self):
+        """Write any pending state to disk and stop the tool pool"""
+        self._flush_state()
+        self.communications_manager.flush()
+        self.fitness_manager.flush()
+        self.productivity_manager.flush()
+        self._tool_pool.shutdown(wait=False)
+
     def get_stats(self):
         """Get assistant statistics"""
         return {
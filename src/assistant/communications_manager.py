@@ -2,13 +2,31 @@
 Communications Manager - Contacts, voice dial, message dictation
 """
 
-import os
-import json
+import atexit
+import bisect
 import logging
+import threading
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
 
+from assistant.json_files import dump_json, load_json_file, write_atomic
+
 logger = logging.getLogger(__name__)
 
+# rapidfuzz is optional - fuzzy matching for names the substring scan misses
+try:
+    from rapidfuzz import process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Minimum rapidfuzz score (0-100) for a partial contact match
+CONTACT_MATCH_CUTOFF = 80
+
+# Seconds to batch draft changes before writing them to disk
+FLUSH_DELAY = 2
+
 
 class CommunicationsManager:
     """Manage communications features"""
@@ -19,36 +37,109 @@ class CommunicationsManager:
         self.data_dir.mkdir(exist_ok=True)
 
         self.contacts_file = self.data_dir / 'contacts.json'
+        self.message_drafts_file = self.data_dir / 'message_drafts.json'
+        self.email_drafts_file = self.data_dir / 'email_drafts.json'
+
+        # Draft writes are batched and flushed by a timer
+        self._flush_lock = threading.Lock()
+        self._pending_writes = {}
+        self._flush_timer = None
+        atexit.register(self.flush)
 
-        # Load contacts
-        self.contacts = self._load_contacts()
+        # Contacts and drafts are loaded on first use (see properties below)
 
         logger.info("Communications Manager initialized")
 
+    @cached_property
+    def contacts(self):
+        """Contacts keyed by casefolded name, loaded on first access"""
+        return self._load_contacts()
+
+    @cached_property
+    def _contact_index(self):
+        """Sorted contact keys for prefix search"""
+        return sorted(self.contacts)
+
+    @cached_property
+    def message_drafts(self):
+        """Message drafts, loaded on first access"""
+        return self._load_drafts(self.message_drafts_file)
+
+    @cached_property
+    def email_drafts(self):
+        """Email drafts, loaded on first access"""
+        return self._load_drafts(self.email_drafts_file)
+
+    def _read_json(self, file_path, default):
+        """Read a JSON file, or return default if it doesn't exist"""
+        if not file_path.exists():
+            return default
+        return load_json_file(file_path)
+
+    def _write_json(self, file_path, data, pretty=False):
+        """Write data to a JSON file atomically, compact unless pretty is set"""
+        write_atomic(file_path, dump_json(data, pretty=pretty))
+
     def _load_contacts(self):
         """Load contacts from file"""
         try:
-            if self.contacts_file.exists():
-                with open(self.contacts_file, 'r') as f:
-                    return json.load(f)
+            contacts = self._read_json(self.contacts_file, {})
+            # Older files were keyed by name.lower(); normalize to casefold
+            return {key.casefold(): contact for key, contact in contacts.items()}
         except Exception as e:
             logger.error(f"Error loading contacts: {e}")
 
         # Default empty contacts
         return {}
 
+    def _load_drafts(self, drafts_file):
+        """Load a drafts list from file"""
+        try:
+            return self._read_json(drafts_file, [])
+        except Exception as e:
+            logger.error(f"Error loading drafts from {drafts_file}: {e}")
+        return []
+
+    def _schedule_save(self, file_path, data):
+        """Queue data to be written to file_path on the next flush"""
+        with self._flush_lock:
+            self._pending_writes[file_path] = data
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write any queued changes to disk"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending_writes = self._pending_writes, {}
+            for file_path, data in pending.items():
+                self._save_drafts(file_path, data)
+
+    def _save_drafts(self, drafts_file, drafts):
+        """Save a drafts list to file"""
+        try:
+            self._write_json(drafts_file, drafts)
+        except Exception as e:
+            logger.error(f"Error saving drafts to {drafts_file}: {e}")
+
     def _save_contacts(self):
         """Save contacts to file"""
         try:
-            with open(self.contacts_file, 'w') as f:
-                json.dump(self.contacts, f, indent=2)
+            # Contacts stay indented so they're easy to edit by hand
+            self._write_json(self.contacts_file, self.contacts, pretty=True)
         except Exception as e:
             logger.error(f"Error saving contacts: {e}")
 
     def add_contact(self, name, phone_number, email=None):
         """Add a contact"""
-        contact_key = name.lower()
+        contact_key = name.casefold()
 
+        if contact_key not in self.contacts:
+            bisect.insort(self._contact_index, contact_key)
         self.contacts[contact_key] = {
             'name': name,
             'phone': phone_number,
@@ -62,56 +153,73 @@ class CommunicationsManager:
 
     def get_contact(self, name):
         """Get contact information by name"""
-        contact_key = name.lower()
+        contact_key = name.casefold()
+        key, contact = self._find_contact(contact_key)
 
-        # Direct match
-        if contact_key in self.contacts:
-            contact = self.contacts[contact_key]
-            result = f"{contact['name']}"
+        if not contact:
+            return f"Contact not found: {name}"
 
-            if contact.get('phone'):
-                result += f", phone: {contact['phone']}"
-            if contact.get('email'):
-                result += f", email: {contact['email']}"
+        # Flag partial matches so the user knows who was picked
+        result = contact['name'] if key == contact_key else f"Found: {contact['name']}"
 
-            logger.info(f"Contact retrieved: {name}")
-            return result
+        if contact.get('phone'):
+            result += f", phone: {contact['phone']}"
+        if contact.get('email'):
+            result += f", email: {contact['email']}"
 
-        # Partial match
-        for key, contact in self.contacts.items():
-            if contact_key in key or key in contact_key:
-                result = f"Found: {contact['name']}"
+        logger.info(f"Contact retrieved: {name}")
+        return result
 
-                if contact.get('phone'):
-                    result += f", phone: {contact['phone']}"
-                if contact.get('email'):
-                    result += f", email: {contact['email']}"
+    def _find_contact(self, contact_key, partial=True):
+        """Find a contact by casefolded name, returning (key, contact) or (None, None).
 
-                return result
+        An exact match wins. Otherwise, if partial is set, names starting
+        with the query are found by binary search on the sorted key index,
+        then by a substring scan. Only if both miss does rapidfuzz (when
+        installed) look for a close misspelling.
+        """
+        if contact_key in self.contacts:
+            return contact_key, self.contacts[contact_key]
+        if not partial:
+            return None, None
 
-        return f"Contact not found: {name}"
+        i = bisect.bisect_left(self._contact_index, contact_key)
+        if i < len(self._contact_index) and self._contact_index[i].startswith(contact_key):
+            key = self._contact_index[i]
+            return key, self.contacts[key]
+
+        for key, contact in self.contacts.items():
+            if contact_key in key or key in contact_key:
+                return key, contact
+
+        if RAPIDFUZZ_AVAILABLE:
+            match = fuzz_process.extractOne(contact_key, self._contact_index,
+                                            score_cutoff=CONTACT_MATCH_CUTOFF)
+            if match:
+                return match[0], self.contacts[match[0]]
+        return None, None
 
     def list_contacts(self):
         """List all contacts"""
         if not self.contacts:
             return "No contacts saved. Add contacts with 'add contact' command."
 
-        contact_list = f"You have {len(self.contacts)} contacts: "
+        parts = [
+            f"{contact['name']} ({contact['phone']})" if contact.get('phone') else contact['name']
+            for contact in islice(self.contacts.values(), 10)  # Limit to first 10
+        ]
 
-        for contact in list(self.contacts.values())[:10]:  # Limit to first 10
-            contact_list += f"{contact['name']}"
-            if contact.get('phone'):
-                contact_list += f" ({contact['phone']})"
-            contact_list += ", "
-
-        return contact_list.strip(', ')
+        return f"You have {len(self.contacts)} contacts: " + ", ".join(parts)
 
     def delete_contact(self, name):
         """Delete a contact"""
-        contact_key = name.lower()
+        contact_key = name.casefold()
 
         if contact_key in self.contacts:
+            # Build the index (if not yet built) while it still holds the key
+            index = self._contact_index
             del self.contacts[contact_key]
+            index.remove(contact_key)
             self._save_contacts()
             logger.info(f"Contact deleted: {name}")
             return f"Deleted contact: {name}"
@@ -120,18 +228,7 @@ class CommunicationsManager:
 
     def call_contact(self, name, bluetooth_manager=None):
         """Initiate a call to a contact"""
-        contact_key = name.lower()
-
-        # Find contact
-        contact = None
-        if contact_key in self.contacts:
-            contact = self.contacts[contact_key]
-        else:
-            # Try partial match
-            for key, c in self.contacts.items():
-                if contact_key in key or key in contact_key:
-                    contact = c
-                    break
+        _, contact = self._find_contact(name.casefold())
 
         if not contact:
             return f"Contact not found: {name}. Add contact first or say full phone number."
@@ -158,14 +255,12 @@ class CommunicationsManager:
         # Note: Sending SMS from Pi requires additional hardware or API services
         # This implementation stores the message draft locally
 
-        contact_key = recipient.lower()
-
         # Find recipient
         recipient_name = recipient
         recipient_phone = None
 
-        if contact_key in self.contacts:
-            contact = self.contacts[contact_key]
+        _, contact = self._find_contact(recipient.casefold(), partial=False)
+        if contact:
             recipient_name = contact['name']
             recipient_phone = contact.get('phone')
 
@@ -176,21 +271,9 @@ class CommunicationsManager:
             'message': message_text
         }
 
-        drafts_file = self.data_dir / 'message_drafts.json'
-
         try:
-            # Load existing drafts
-            drafts = []
-            if drafts_file.exists():
-                with open(drafts_file, 'r') as f:
-                    drafts = json.load(f)
-
-            # Add new draft
-            drafts.append(draft)
-
-            # Save
-            with open(drafts_file, 'w') as f:
-                json.dump(drafts, f, indent=2)
+            self.message_drafts.append(draft)
+            self._schedule_save(self.message_drafts_file, self.message_drafts)
 
             logger.info(f"Message draft saved: to {recipient_name}")
 
@@ -205,24 +288,18 @@ class CommunicationsManager:
 
     def get_message_drafts(self):
         """Get saved message drafts"""
-        drafts_file = self.data_dir / 'message_drafts.json'
-
         try:
-            if not drafts_file.exists():
-                return "No message drafts saved"
-
-            with open(drafts_file, 'r') as f:
-                drafts = json.load(f)
+            drafts = self.message_drafts
 
             if not drafts:
                 return "No message drafts saved"
 
-            result = f"You have {len(drafts)} message drafts: "
+            parts = [
+                f"{i}. To {draft['to']}: {draft['message'][:30]}..."
+                for i, draft in enumerate(drafts[-5:], 1)  # Last 5
+            ]
 
-            for i, draft in enumerate(drafts[-5:], 1):  # Last 5
-                result += f"{i}. To {draft['to']}: {draft['message'][:30]}... "
-
-            return result.strip()
+            return f"You have {len(drafts)} message drafts: " + " ".join(parts)
 
         except Exception as e:
             logger.error(f"Error reading drafts: {e}")
@@ -230,11 +307,12 @@ class CommunicationsManager:
 
     def clear_message_drafts(self):
         """Clear all message drafts"""
-        drafts_file = self.data_dir / 'message_drafts.json'
-
         try:
-            if drafts_file.exists():
-                drafts_file.unlink()
+            self.message_drafts.clear()
+            with self._flush_lock:
+                self._pending_writes.pop(self.message_drafts_file, None)
+            if self.message_drafts_file.exists():
+                self.message_drafts_file.unlink()
 
             logger.info("Message drafts cleared")
             return "All message drafts cleared"
@@ -248,15 +326,12 @@ class CommunicationsManager:
         # Similar to messages, actual email sending requires SMTP setup
         # This stores email drafts locally
 
-        email_drafts_file = self.data_dir / 'email_drafts.json'
-
         # Find recipient email if it's a contact name
         recipient_email = recipient
         if '@' not in recipient:
             # Look up in contacts
-            contact_key = recipient.lower()
-            if contact_key in self.contacts:
-                contact = self.contacts[contact_key]
+            _, contact = self._find_contact(recipient.casefold(), partial=False)
+            if contact:
                 recipient_email = contact.get('email', recipient)
 
         draft = {
@@ -266,18 +341,8 @@ class CommunicationsManager:
         }
 
         try:
-            # Load existing drafts
-            drafts = []
-            if email_drafts_file.exists():
-                with open(email_drafts_file, 'r') as f:
-                    drafts = json.load(f)
-
-            # Add new draft
-            drafts.append(draft)
-
-            # Save
-            with open(email_drafts_file, 'w') as f:
-                json.dump(drafts, f, indent=2)
+            self.email_drafts.append(draft)
+            self._schedule_save(self.email_drafts_file, self.email_drafts)
 
             logger.info(f"Email draft saved: to {recipient_email}")
 
@@ -293,24 +358,18 @@ class CommunicationsManager:
 
     def get_email_drafts(self):
         """Get saved email drafts"""
-        email_drafts_file = self.data_dir / 'email_drafts.json'
-
         try:
-            if not email_drafts_file.exists():
-                return "No email drafts saved"
-
-            with open(email_drafts_file, 'r') as f:
-                drafts = json.load(f)
+            drafts = self.email_drafts
 
             if not drafts:
                 return "No email drafts saved"
 
-            result = f"You have {len(drafts)} email drafts: "
-
-            for i, draft in enumerate(drafts[-5:], 1):  # Last 5
-                result += f"{i}. To {draft['to']}, Subject: {draft['subject']}. "
+            parts = [
+                f"{i}. To {draft['to']}, Subject: {draft['subject']}."
+                for i, draft in enumerate(drafts[-5:], 1)  # Last 5
+            ]
 
-            return result.strip()
+            return f"You have {len(drafts)} email drafts: " + " ".join(parts)
 
         except Exception as e:
             logger.error(f"Error reading email drafts: {e}")
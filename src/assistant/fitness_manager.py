@@ -2,14 +2,59 @@
 Fitness & Health Manager - Step counter, workout timer, water reminder, health tracking
 """
 
-import json
+import atexit
+import bisect
 import logging
+import threading
 import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from assistant.json_files import dump_json, load_json_file, write_atomic
+
 logger = logging.getLogger(__name__)
 
+# Seconds to batch log changes before writing them to disk
+FLUSH_DELAY = 2
+
+# Most workouts kept in history; older ones are dropped
+MAX_WORKOUT_HISTORY = 5000
+
+# Heart rate zone boundaries as fractions of max HR, and the zone below each
+_HR_ZONE_EDGES = (0.50, 0.60, 0.70, 0.85, 1.00)
+_HR_ZONE_NAMES = ('resting', 'warm_up', 'fat_burn', 'cardio', 'peak', 'above max')
+
+# MET values (Metabolic Equivalent of Task)
+_MET_VALUES = {
+    'walking': 3.5,
+    'running': 9.0,
+    'cycling': 7.0,
+    'swimming': 8.0,
+    'yoga': 3.0,
+    'strength': 5.0,
+    'hiit': 10.0,
+    'dancing': 5.5,
+    'basketball': 8.0,
+    'soccer': 10.0
+}
+
+_LBS_TO_KG = 0.453592
+
+
+def _day_bucket(ts):
+    """Local-time day number for an epoch timestamp"""
+    return (ts + time.localtime(ts).tm_gmtoff) // 86400
+
+
+def _strip_cached_fields(data):
+    """Copy data without the in-memory '_'-prefixed keys (e.g. '_dt')"""
+    if isinstance(data, dict):
+        return {k: _strip_cached_fields(v) for k, v in data.items() if not k.startswith('_')}
+    if isinstance(data, list):
+        return [_strip_cached_fields(v) for v in data]
+    return data
+
 
 class FitnessManager:
     """Manage fitness and health features"""
@@ -22,6 +67,12 @@ class FitnessManager:
         self.fitness_file = self.data_dir / 'fitness_data.json'
         self.water_file = self.data_dir / 'water_log.json'
 
+        # Writes are batched and flushed by a timer
+        self._flush_lock = threading.Lock()
+        self._pending_writes = {}
+        self._flush_timer = None
+        atexit.register(self.flush)
+
         # Load data
         self.fitness_data = self._load_json(self.fitness_file, {
             'daily_step_goal': 10000,
@@ -29,7 +80,14 @@ class FitnessManager:
             'workout_history': []
         })
 
+        history = self.fitness_data.setdefault('workout_history', [])
+        if len(history) > MAX_WORKOUT_HISTORY:
+            del history[:-MAX_WORKOUT_HISTORY]
+        self._index_workouts()
+
         self.water_log = self._load_json(self.water_file, [])
+        self._migrate_water_log()
+        self._water_totals_by_day = self._build_water_totals()
 
         # Workout timer state
         self.workout_start_time = None
@@ -41,17 +99,96 @@ class FitnessManager:
         """Load JSON file"""
         try:
             if file_path.exists():
-                with open(file_path, 'r') as f:
-                    return json.load(f)
+                return load_json_file(file_path)
         except Exception as e:
             logger.error(f"Error loading {file_path}: {e}")
         return default
 
+    def _index_workouts(self):
+        """Group workout history by day, with the days kept sorted.
+
+        Each record's parsed date is cached in memory as '_dt'.
+        """
+        self._workouts_by_day = defaultdict(list)
+        history = self.fitness_data.get('workout_history', [])
+        valid = []
+        for workout in history:
+            try:
+                workout['_dt'] = datetime.fromisoformat(workout['date'])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Dropping workout record with bad date {workout!r}: {e}")
+                continue
+            valid.append(workout)
+            self._workouts_by_day[workout['_dt'].date()].append(workout)
+        if len(valid) != len(history):
+            history[:] = valid
+        self._workout_days = sorted(self._workouts_by_day)
+
+    def _trim_workout_history(self):
+        """Drop the oldest workouts once history is over MAX_WORKOUT_HISTORY"""
+        history = self.fitness_data['workout_history']
+        while len(history) > MAX_WORKOUT_HISTORY:
+            oldest = history.pop(0)
+            day = oldest['_dt'].date()
+            self._workouts_by_day[day].remove(oldest)
+            if not self._workouts_by_day[day]:
+                del self._workouts_by_day[day]
+                self._workout_days.remove(day)
+
+    def _migrate_water_log(self):
+        """Convert entries from the old {'date': iso, 'ounces': x} format"""
+        migrated = False
+        entries = []
+        for entry in self.water_log:
+            # Anything that isn't a dict can't be converted and is dropped below
+            if not isinstance(entry, dict) or 'date' in entry:
+                migrated = True
+                try:
+                    entry = {
+                        'ts': int(datetime.fromisoformat(entry['date']).timestamp()),
+                        'oz': float(entry.get('ounces', 0))
+                    }
+                except (AttributeError, KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Dropping water log entry {entry!r}: {e}")
+                    continue
+            entries.append(entry)
+
+        if migrated:
+            self.water_log[:] = entries
+            logger.info("Migrated water log to timestamp format")
+            self._schedule_save(self.water_file, self.water_log)
+
+    def _build_water_totals(self):
+        """Sum the water log into per-day totals"""
+        totals = defaultdict(float)
+        for entry in self.water_log:
+            totals[_day_bucket(entry['ts'])] += entry['oz']
+        return totals
+
+    def _schedule_save(self, file_path, data):
+        """Queue data to be written to file_path on the next flush"""
+        with self._flush_lock:
+            self._pending_writes[file_path] = data
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write any queued changes to disk"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending_writes = self._pending_writes, {}
+            for file_path, data in pending.items():
+                self._save_json(file_path, data)
+
     def _save_json(self, file_path, data):
         """Save JSON file"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            data = _strip_cached_fields(data)
+            write_atomic(file_path, dump_json(data))
         except Exception as e:
             logger.error(f"Error saving {file_path}: {e}")
 
@@ -72,15 +209,22 @@ class FitnessManager:
         duration_minutes = duration_seconds // 60
 
         # Record workout
+        now = datetime.now()
         workout_record = {
             'type': self.workout_type or 'workout',
-            'date': datetime.now().isoformat(),
+            'date': now.isoformat(),
             'duration_seconds': duration_seconds,
-            'duration_minutes': duration_minutes
+            'duration_minutes': duration_minutes,
+            '_dt': now
         }
 
         self.fitness_data['workout_history'].append(workout_record)
-        self._save_json(self.fitness_file, self.fitness_data)
+        today = now.date()
+        if today not in self._workouts_by_day:
+            bisect.insort(self._workout_days, today)
+        self._workouts_by_day[today].append(workout_record)
+        self._trim_workout_history()
+        self._schedule_save(self.fitness_file, self.fitness_data)
 
         result = f"{self.workout_type.capitalize()} completed! Duration: {duration_minutes} minutes"
 
@@ -109,16 +253,19 @@ class FitnessManager:
         try:
             ounces = float(ounces)
 
+            ts = int(time.time())
             log_entry = {
-                'date': datetime.now().isoformat(),
-                'ounces': ounces
+                'ts': ts,
+                'oz': ounces
             }
 
             self.water_log.append(log_entry)
-            self._save_json(self.water_file, self.water_log)
+            today = _day_bucket(ts)
+            self._water_totals_by_day[today] += ounces
+            self._schedule_save(self.water_file, self.water_log)
 
-            # Calculate today's total
-            today_total = self.get_today_water_total()
+            # Today's total, reusing the day we just logged against
+            today_total = self._water_totals_by_day[today]
 
             result = f"Logged {ounces} oz of water. Today's total: {today_total} oz"
 
@@ -136,15 +283,7 @@ class FitnessManager:
 
     def get_today_water_total(self):
         """Get total water for today"""
-        today = datetime.now().date()
-
-        total = 0
-        for entry in self.water_log:
-            entry_date = datetime.fromisoformat(entry['date']).date()
-            if entry_date == today:
-                total += entry.get('ounces', 0)
-
-        return total
+        return self._water_totals_by_day.get(_day_bucket(int(time.time())), 0)
 
     def get_water_status(self):
         """Get water intake status"""
@@ -167,7 +306,7 @@ class FitnessManager:
         try:
             ounces = float(ounces)
             self.fitness_data['water_goal_oz'] = ounces
-            self._save_json(self.fitness_file, self.fitness_data)
+            self._schedule_save(self.fitness_file, self.fitness_data)
 
             logger.info(f"Water goal set: {ounces} oz")
             return f"Daily water goal set to {ounces} ounces"
@@ -197,11 +336,19 @@ class FitnessManager:
     def get_workout_summary(self, days=7):
         """Get workout summary for past N days"""
         cutoff_date = datetime.now() - timedelta(days=days)
-
-        recent_workouts = [
-            w for w in self.fitness_data.get('workout_history', [])
-            if datetime.fromisoformat(w['date']) > cutoff_date
-        ]
+        cutoff_day = cutoff_date.date()
+
+        # Only the cutoff day itself needs its timestamps checked
+        start = bisect.bisect_left(self._workout_days, cutoff_day)
+        recent_workouts = []
+        for day in self._workout_days[start:]:
+            if day == cutoff_day:
+                recent_workouts.extend(
+                    w for w in self._workouts_by_day[day]
+                    if w['_dt'] > cutoff_date
+                )
+            else:
+                recent_workouts.extend(self._workouts_by_day[day])
 
         if not recent_workouts:
             return f"No workouts recorded in the past {days} days"
@@ -224,21 +371,11 @@ class FitnessManager:
             # Calculate max heart rate (220 - age)
             max_hr = 220 - age
 
-            # Calculate zones
-            zones = {
-                'resting': (0, max_hr * 0.50),
-                'warm_up': (max_hr * 0.50, max_hr * 0.60),
-                'fat_burn': (max_hr * 0.60, max_hr * 0.70),
-                'cardio': (max_hr * 0.70, max_hr * 0.85),
-                'peak': (max_hr * 0.85, max_hr)
-            }
-
-            # Determine zone
-            current_zone = 'above max'
-            for zone_name, (low, high) in zones.items():
-                if low <= hr < high:
-                    current_zone = zone_name
-                    break
+            # Determine zone; no zone fits a negative rate or a max HR of 0 or less
+            if hr < 0 or max_hr <= 0:
+                current_zone = 'above max'
+            else:
+                current_zone = _HR_ZONE_NAMES[bisect.bisect_right(_HR_ZONE_EDGES, hr / max_hr)]
 
             result = f"Heart rate {hr} bpm. Zone: {current_zone}. Max HR: {max_hr} bpm"
 
@@ -255,25 +392,10 @@ class FitnessManager:
             duration = float(duration_minutes)
             weight = float(weight_lbs)
 
-            # MET values (Metabolic Equivalent of Task)
-            met_values = {
-                'walking': 3.5,
-                'running': 9.0,
-                'cycling': 7.0,
-                'swimming': 8.0,
-                'yoga': 3.0,
-                'strength': 5.0,
-                'hiit': 10.0,
-                'dancing': 5.5,
-                'basketball': 8.0,
-                'soccer': 10.0
-            }
-
-            activity_lower = activity.lower()
-            met = met_values.get(activity_lower, 5.0)  # Default to moderate
+            met = _MET_VALUES.get(activity.lower(), 5.0)  # Default to moderate
 
             # Calories = MET * weight(kg) * duration(hours)
-            weight_kg = weight * 0.453592
+            weight_kg = weight * _LBS_TO_KG
             duration_hours = duration / 60
 
             calories = met * weight_kg * duration_hours
@@ -0,0 +1,80 @@
+"""
+HTTP helpers shared by the lookup managers - pooled sessions, status checks, JSON decoding
+"""
+
+import importlib.util
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional - much faster on the Pi, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# requests-cache is optional - persistent HTTP response cache, no cache otherwise.
+# Only looked up here; the package itself is imported when a session is built.
+REQUESTS_CACHE_AVAILABLE = importlib.util.find_spec('requests_cache') is not None
+
+USER_AGENT = 'SmartGlasses/1.0'
+
+
+def check_response(response):
+    """Raise HTTPError for 4xx/5xx responses, with a plain status check on the happy path"""
+    if response.status_code >= 400:
+        raise requests.exceptions.HTTPError(
+            f"{response.status_code} Error for url: {response.url}", response=response)
+    return response
+
+
+def parse_json(response):
+    """Decode a response body, with orjson when it's installed"""
+    if not ORJSON_AVAILABLE:
+        return response.json()
+    try:
+        # Parsed straight from the already-decompressed bytes; the body is never decoded to str
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Surface like requests does, so RequestException handlers still apply
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+
+def create_session(cache_name=None, urls_expire_after=None, ignored_parameters=()):
+    """HTTP session with keep-alive pooling and retries on gateway errors.
+
+    If cache_name is given and requests-cache is installed, GET responses
+    are also cached on disk in that file, with per-URL lifetimes from
+    urls_expire_after. ignored_parameters (e.g. API keys) are left out of
+    the cache keys and stored responses.
+    """
+    if cache_name and REQUESTS_CACHE_AVAILABLE:
+        import requests_cache
+        session = requests_cache.CachedSession(
+            cache_name,
+            backend='sqlite',
+            expire_after=600,
+            allowable_methods=('GET',),
+            urls_expire_after=urls_expire_after,
+            ignored_parameters=list(ignored_parameters)
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json'
+    })
+    retry_options = dict(total=2, connect=2, read=1, backoff_factor=0.25,
+                         status_forcelist=(502, 503, 504))
+    try:
+        retry = Retry(backoff_jitter=0.1, **retry_options)  # urllib3 2.x
+    except TypeError:
+        retry = Retry(**retry_options)
+    # Parallel lookups (briefing, combined searches, trip geocoding) each take
+    # their own kept-alive connection from the host's pool. The APIs are all on
+    # different hosts, so HTTP/2 multiplexing would save little over this.
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -5,11 +5,109 @@ Information & Lookup Manager - Weather, news, Wikipedia, definitions, conversion
 import os
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 import requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
+from assistant.http_utils import check_response, create_session, parse_json
+
 logger = logging.getLogger(__name__)
 
+# (connect, read) seconds - fail fast on DNS/TCP stalls, allow slower bodies
+HTTP_TIMEOUT = (1.5, 4.0)
+
+# Worker threads for independent lookups that are fetched together
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='info')
+
+# Seconds to wait for each fanned-out lookup
+FAN_OUT_TIMEOUT = 6
+
+# Where one sentence ends and the next begins in an extract. Short capitalised
+# words like "Dr." or "St." aren't treated as sentence ends.
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])(?<!\b[A-Z][a-z]\.)(?<!\b[A-Z][a-z]{2}\.)\s+(?=[A-Z0-9"(])')
+
+# Most ETag-validated response bodies kept for conditional GETs
+ETAG_CACHE_SIZE = 64
+
+# Seconds each kind of response is reused before it's fetched again
+WEATHER_CACHE_TTL = 600
+FORECAST_CACHE_TTL = 1800
+NEWS_CACHE_TTL = 300
+WIKIPEDIA_CACHE_TTL = 86400
+DEFINITION_CACHE_TTL = 86400 * 7
+FX_CACHE_TTL = 3600
+
+# Most responses kept in memory across all lookups
+RESPONSE_CACHE_SIZE = 256
+
+# Same lifetimes for the on-disk HTTP cache
+HTTP_CACHE_FILE = 'info_cache'
+HTTP_CACHE_EXPIRY = {
+    'api.openweathermap.org/data/2.5/weather': WEATHER_CACHE_TTL,
+    'api.openweathermap.org/data/2.5/forecast': FORECAST_CACHE_TTL,
+    'newsapi.org': NEWS_CACHE_TTL,
+    'en.wikipedia.org': WIKIPEDIA_CACHE_TTL,
+    'api.dictionaryapi.dev': DEFINITION_CACHE_TTL,
+    'api.exchangerate-api.com': FX_CACHE_TTL,
+}
+
+# Conversion factors to base units (None marks temperature units)
+_UNIT_FACTORS = {
+    # Length (to meters)
+    'meter': 1, 'meters': 1, 'm': 1,
+    'kilometer': 1000, 'kilometers': 1000, 'km': 1000,
+    'centimeter': 0.01, 'centimeters': 0.01, 'cm': 0.01,
+    'millimeter': 0.001, 'millimeters': 0.001, 'mm': 0.001,
+    'mile': 1609.34, 'miles': 1609.34, 'mi': 1609.34,
+    'yard': 0.9144, 'yards': 0.9144, 'yd': 0.9144,
+    'foot': 0.3048, 'feet': 0.3048, 'ft': 0.3048,
+    'inch': 0.0254, 'inches': 0.0254, 'in': 0.0254,
+
+    # Weight (to kilograms)
+    'kilogram': 1, 'kilograms': 1, 'kg': 1,
+    'gram': 0.001, 'grams': 0.001, 'g': 0.001,
+    'pound': 0.453592, 'pounds': 0.453592, 'lb': 0.453592, 'lbs': 0.453592,
+    'ounce': 0.0283495, 'ounces': 0.0283495, 'oz': 0.0283495,
+
+    # Temperature (special case)
+    'celsius': None, 'c': None,
+    'fahrenheit': None, 'f': None,
+    'kelvin': None, 'k': None,
+
+    # Volume (to liters)
+    'liter': 1, 'liters': 1, 'l': 1,
+    'milliliter': 0.001, 'milliliters': 0.001, 'ml': 0.001,
+    'gallon': 3.78541, 'gallons': 3.78541, 'gal': 3.78541,
+    'quart': 0.946353, 'quarts': 0.946353, 'qt': 0.946353,
+    'pint': 0.473176, 'pints': 0.473176, 'pt': 0.473176,
+    'cup': 0.236588, 'cups': 0.236588,
+    'fluid_ounce': 0.0295735, 'fluid_ounces': 0.0295735, 'fl_oz': 0.0295735,
+}
+
+_TEMP_UNITS = frozenset({'celsius', 'c', 'fahrenheit', 'f', 'kelvin', 'k'})
+
+# Temperature unit aliases, and conversions to and from Celsius
+_TEMP_NORMALIZE = {
+    'c': 'celsius', 'celsius': 'celsius',
+    'f': 'fahrenheit', 'fahrenheit': 'fahrenheit',
+    'k': 'kelvin', 'kelvin': 'kelvin'
+}
+_TO_CELSIUS = {
+    'celsius': lambda v: v,
+    'fahrenheit': lambda v: (v - 32) * 5/9,
+    'kelvin': lambda v: v - 273.15
+}
+_FROM_CELSIUS = {
+    'celsius': lambda c: c,
+    'fahrenheit': lambda c: (c * 9/5) + 32,
+    'kelvin': lambda c: c + 273.15
+}
+
 
 class InfoManager:
     """Manage information lookup features"""
@@ -24,8 +122,144 @@ class InfoManager:
         # Default location (can be overridden)
         self.default_location = os.getenv('DEFAULT_LOCATION', 'New York')
 
+        # Shared session so repeat lookups reuse connections, built on first use
+        self._http = None
+        self._http_lock = threading.Lock()
+
+        # (kind, args) -> (fetched at, parsed data), least recently used first.
+        # Works without requests-cache and skips the network entirely when fresh.
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # (url, params) -> (ETag, parsed body) for revalidating with If-None-Match
+        self._etags = {}
+        self._etag_lock = threading.Lock()
+
         logger.info("Information Manager initialized")
 
+    @property
+    def http(self):
+        """Shared HTTP session, created on first request rather than at startup"""
+        if self._http is None:
+            with self._http_lock:  # briefing lookups can arrive together on pool threads
+                if self._http is None:
+                    self._http = create_session(
+                        HTTP_CACHE_FILE, HTTP_CACHE_EXPIRY,
+                        ignored_parameters=('appid', 'apiKey'))  # keep API keys out of the cache
+        return self._http
+
+    def _cached(self, key, ttl, fetch):
+        """Return fresh cached data for key, otherwise call fetch() and keep its result"""
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and now - entry[0] < ttl:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        # Fetch outside the lock so slow lookups don't hold up the others
+        data = fetch()
+        if data is not None:
+            with self._cache_lock:
+                self._cache[key] = (now, data)
+                self._cache.move_to_end(key)
+                if len(self._cache) > RESPONSE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return data
+
+    def _get_json(self, url, params=None):
+        """GET and parse JSON, raising for HTTP errors"""
+        response = self.http.get(url, params=params, timeout=HTTP_TIMEOUT)
+        check_response(response)
+        return parse_json(response)
+
+    def _get_json_conditional(self, url, params):
+        """GET and parse JSON, revalidating a previously seen response by its ETag"""
+        key = (url, tuple(sorted(params.items())))
+        cached = self._etags.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+
+        response = self.http.get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304 and cached:
+            return cached[1]
+
+        check_response(response)
+        data = parse_json(response)
+
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._etag_lock:
+                self._etags.pop(key, None)
+                self._etags[key] = (etag, data)
+                if len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.pop(next(iter(self._etags)))
+        return data
+
+    def _fetch_current(self, location):
+        """Fetch current conditions JSON from OpenWeatherMap"""
+        url = "http://api.openweathermap.org/data/2.5/weather"
+        params = {
+            'q': location,
+            'appid': self.openweather_api_key,
+            'units': 'imperial'  # Fahrenheit
+        }
+
+        return self._cached(('weather', location), WEATHER_CACHE_TTL,
+                            lambda: self._get_json(url, params))
+
+    def _format_current(self, location, data):
+        """Turn current conditions JSON into a spoken report"""
+        temp = data['main']['temp']
+        feels_like = data['main']['feels_like']
+        description = data['weather'][0]['description']
+        humidity = data['main']['humidity']
+        wind_speed = data['wind']['speed']
+
+        return (
+            f"In {location}, it's {temp:.0f}°F and {description}. "
+            f"Feels like {feels_like:.0f}°. "
+            f"Humidity {humidity}%, wind {wind_speed:.0f} mph."
+        )
+
+    def _fetch_forecast(self, location, days):
+        """Fetch forecast JSON from OpenWeatherMap"""
+        url = "http://api.openweathermap.org/data/2.5/forecast"
+        params = {
+            'q': location,
+            'appid': self.openweather_api_key,
+            'units': 'imperial',
+            'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
+        }
+
+        return self._cached(('forecast', location, days), FORECAST_CACHE_TTL,
+                            lambda: self._get_json(url, params))
+
+    def _format_forecast(self, location, days, data):
+        """Turn forecast JSON into daily high/low summaries"""
+        forecast_text = f"Forecast for {location}: "
+
+        # Group by day and get high/low
+        daily_data = {}
+        for item in data['list'][:days * 8]:
+            date = datetime.fromtimestamp(item['dt']).strftime('%A')
+            temp = item['main']['temp']
+            desc = item['weather'][0]['description']
+
+            # Track each day's high/low as we go
+            day = daily_data.get(date)
+            if day is None:
+                daily_data[date] = {'hi': temp, 'lo': temp, 'desc': desc}
+            elif temp > day['hi']:
+                day['hi'] = temp
+            elif temp < day['lo']:
+                day['lo'] = temp
+
+        # Format forecast
+        for day, info in list(daily_data.items())[:days]:
+            forecast_text += f"{day}: {info['hi']:.0f}°/{info['lo']:.0f}°, {info['desc']}. "
+
+        return forecast_text.strip()
+
     def get_weather(self, location=None):
         """Get current weather for a location"""
         if not self.openweather_api_key:
@@ -34,30 +268,7 @@ class InfoManager:
         location = location or self.default_location
 
         try:
-            # OpenWeatherMap current weather API
-            url = "http://api.openweathermap.org/data/2.5/weather"
-            params = {
-                'q': location,
-                'appid': self.openweather_api_key,
-                'units': 'imperial'  # Fahrenheit
-            }
-
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract key info
-            temp = data['main']['temp']
-            feels_like = data['main']['feels_like']
-            description = data['weather'][0]['description']
-            humidity = data['main']['humidity']
-            wind_speed = data['wind']['speed']
-
-            weather_report = (
-                f"In {location}, it's {temp:.0f}°F and {description}. "
-                f"Feels like {feels_like:.0f}°. "
-                f"Humidity {humidity}%, wind {wind_speed:.0f} mph."
-            )
+            weather_report = self._format_current(location, self._fetch_current(location))
 
             logger.info(f"Weather retrieved for {location}")
             return weather_report
@@ -74,50 +285,31 @@ class InfoManager:
         location = location or self.default_location
 
         try:
-            url = "http://api.openweathermap.org/data/2.5/forecast"
-            params = {
-                'q': location,
-                'appid': self.openweather_api_key,
-                'units': 'imperial',
-                'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
-            }
-
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            # Get daily summaries
-            forecast_text = f"Forecast for {location}: "
-
-            # Group by day and get high/low
-            daily_data = {}
-            for item in data['list'][:days * 8]:
-                date = datetime.fromtimestamp(item['dt']).strftime('%A')
-                temp = item['main']['temp']
-                desc = item['weather'][0]['description']
-
-                if date not in daily_data:
-                    daily_data[date] = {'temps': [], 'desc': desc}
-                daily_data[date]['temps'].append(temp)
-
-            # Format forecast
-            for day, info in list(daily_data.items())[:days]:
-                high = max(info['temps'])
-                low = min(info['temps'])
-                forecast_text += f"{day}: {high:.0f}°/{low:.0f}°, {info['desc']}. "
+            forecast_text = self._format_forecast(location, days, self._fetch_forecast(location, days))
 
             logger.info(f"Forecast retrieved for {location}")
-            return forecast_text.strip()
+            return forecast_text
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Forecast API error: {e}")
             return "Couldn't get forecast."
 
     def get_news(self, topic=None, count=3):
-        """Get latest news headlines"""
+        """Get latest news headlines. topic may be a list to fetch several at once."""
         if not self.news_api_key:
             return "News service not configured. Set NEWS_API_KEY environment variable. Get a free key at https://newsapi.org"
 
+        if isinstance(topic, (list, tuple)):
+            futures = [(t, _EXECUTOR.submit(self.get_news, t, count)) for t in topic]
+            digests = []
+            for t, future in futures:
+                try:
+                    digests.append(future.result(timeout=FAN_OUT_TIMEOUT))
+                except FuturesTimeoutError:
+                    logger.error(f"News lookup timed out for {t}")
+                    digests.append(f"Couldn't get news about {t} in time.")
+            return " ".join(digests)
+
         try:
             url = "https://newsapi.org/v2/top-headlines"
             params = {
@@ -129,9 +321,8 @@ class InfoManager:
             if topic:
                 params['q'] = topic
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._cached(('news', topic, count), NEWS_CACHE_TTL,
+                                lambda: self._get_json_conditional(url, params))
 
             if data.get('status') != 'ok' or not data.get('articles'):
                 return "No news articles found."
@@ -153,28 +344,77 @@ class InfoManager:
             logger.error(f"News API error: {e}")
             return "Couldn't get news. Check your internet connection."
 
+    def _get_wikipedia_page(self, query):
+        """Fetch the opening sentences of the Wikipedia page for query"""
+        url = "https://en.wikipedia.org/w/api.php"
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'prop': 'extracts|pageprops',
+            'ppprop': 'disambiguation',
+            'exintro': 1,
+            'explaintext': 1,
+            'exsentences': 2,  # only what gets read out
+            'titles': query,
+            'redirects': 1
+        }
+
+        data = self._cached(('wikipedia', query), WIKIPEDIA_CACHE_TTL,
+                            lambda: self._get_json_conditional(url, params))
+        pages = data.get('query', {}).get('pages', [])
+        return pages[0] if pages else {}
+
+    def morning_briefing(self, location=None, topics=None):
+        """Weather, forecast and headlines together, with every lookup fetched at once"""
+        location = location or self.default_location
+
+        lookups = []
+        if self.openweather_api_key:
+            lookups.append(('weather', _EXECUTOR.submit(self.get_weather, location)))
+            lookups.append(('forecast', _EXECUTOR.submit(self.get_forecast, location)))
+        if self.news_api_key:
+            for topic in topics or [None]:
+                lookups.append((topic or 'news', _EXECUTOR.submit(self.get_news, topic, 2)))
+
+        if not lookups:
+            return "Briefing needs OPENWEATHER_API_KEY or NEWS_API_KEY to be set."
+
+        # One deadline for the whole briefing rather than per lookup
+        deadline = time.monotonic() + FAN_OUT_TIMEOUT
+        parts = []
+        for name, future in lookups:
+            try:
+                parts.append(future.result(timeout=max(0, deadline - time.monotonic())))
+            except FuturesTimeoutError:
+                logger.error(f"Briefing lookup timed out: {name}")
+
+        if not parts:
+            return "Couldn't put together a briefing right now. Try again in a moment."
+
+        logger.info(f"Briefing prepared for {location}")
+        return " ".join(parts)
+
     def search_wikipedia(self, query):
         """Search Wikipedia for information"""
         try:
             # Wikipedia API
-            url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + query.replace(' ', '_')
-
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            page = self._get_wikipedia_page(query)
 
-            if data.get('type') == 'disambiguation':
+            if 'disambiguation' in page.get('pageprops', {}):
                 return f"'{query}' is ambiguous. Please be more specific."
 
-            # Get extract (summary)
-            extract = data.get('extract', '')
+            # Get extract (the API already trims it to 2 sentences for voice)
+            summary = page.get('extract', '').strip()
 
-            if not extract:
+            if page.get('missing') or not summary:
                 return f"No Wikipedia article found for '{query}'."
 
-            # Limit to first 2-3 sentences for voice
-            sentences = extract.split('. ')
-            summary = '. '.join(sentences[:2]) + '.'
+            # The API's sentence count isn't exact; stop at the second boundary
+            # without splitting the rest of the extract
+            boundaries = [m.start() for m in islice(_SENTENCE_BOUNDARY.finditer(summary), 2)]
+            if len(boundaries) == 2:
+                summary = summary[:boundaries[1]]
 
             logger.info(f"Wikipedia search for: {query}")
             return summary
@@ -188,15 +428,18 @@ class InfoManager:
             logger.error(f"Wikipedia API error: {e}")
             return "Wikipedia search failed."
 
+    def _get_definition_json(self, word):
+        """Fetch dictionary entries JSON for a lowercase word"""
+        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+
+        return self._cached(('definition', word), DEFINITION_CACHE_TTL,
+                            lambda: self._get_json(url))
+
     def define_word(self, word):
         """Get definition of a word"""
         try:
             # Free Dictionary API
-            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_definition_json(word.lower())
 
             if not data or len(data) == 0:
                 return f"No definition found for '{word}'."
@@ -247,52 +490,22 @@ class InfoManager:
         except ValueError:
             return f"Invalid number: {value}"
 
-        from_unit = from_unit.lower()
-        to_unit = to_unit.lower()
-
-        # Conversion factors to base units
-        conversions = {
-            # Length (to meters)
-            'meter': 1, 'meters': 1, 'm': 1,
-            'kilometer': 1000, 'kilometers': 1000, 'km': 1000,
-            'centimeter': 0.01, 'centimeters': 0.01, 'cm': 0.01,
-            'millimeter': 0.001, 'millimeters': 0.001, 'mm': 0.001,
-            'mile': 1609.34, 'miles': 1609.34, 'mi': 1609.34,
-            'yard': 0.9144, 'yards': 0.9144, 'yd': 0.9144,
-            'foot': 0.3048, 'feet': 0.3048, 'ft': 0.3048,
-            'inch': 0.0254, 'inches': 0.0254, 'in': 0.0254,
-
-            # Weight (to kilograms)
-            'kilogram': 1, 'kilograms': 1, 'kg': 1,
-            'gram': 0.001, 'grams': 0.001, 'g': 0.001,
-            'pound': 0.453592, 'pounds': 0.453592, 'lb': 0.453592, 'lbs': 0.453592,
-            'ounce': 0.0283495, 'ounces': 0.0283495, 'oz': 0.0283495,
-
-            # Temperature (special case)
-            'celsius': None, 'c': None,
-            'fahrenheit': None, 'f': None,
-            'kelvin': None, 'k': None,
-
-            # Volume (to liters)
-            'liter': 1, 'liters': 1, 'l': 1,
-            'milliliter': 0.001, 'milliliters': 0.001, 'ml': 0.001,
-            'gallon': 3.78541, 'gallons': 3.78541, 'gal': 3.78541,
-            'quart': 0.946353, 'quarts': 0.946353, 'qt': 0.946353,
-            'pint': 0.473176, 'pints': 0.473176, 'pt': 0.473176,
-            'cup': 0.236588, 'cups': 0.236588,
-            'fluid_ounce': 0.0295735, 'fluid_ounces': 0.0295735, 'fl_oz': 0.0295735,
-        }
+        # Units usually arrive lowercase already; only lower() on a miss
+        if from_unit not in _UNIT_FACTORS:
+            from_unit = from_unit.lower()
+        if to_unit not in _UNIT_FACTORS:
+            to_unit = to_unit.lower()
 
         # Handle temperature conversions specially
-        if from_unit in ['celsius', 'c', 'fahrenheit', 'f', 'kelvin', 'k']:
+        if from_unit in _TEMP_UNITS:
             return self._convert_temperature(value, from_unit, to_unit)
 
         # Get conversion factors
-        if from_unit not in conversions or to_unit not in conversions:
+        if from_unit not in _UNIT_FACTORS or to_unit not in _UNIT_FACTORS:
             return f"Unknown units: {from_unit} or {to_unit}"
 
-        from_factor = conversions[from_unit]
-        to_factor = conversions[to_unit]
+        from_factor = _UNIT_FACTORS[from_unit]
+        to_factor = _UNIT_FACTORS[to_unit]
 
         if from_factor is None or to_factor is None:
             return "Cannot convert between these unit types"
@@ -304,48 +517,57 @@ class InfoManager:
         logger.info(f"Unit conversion: {value} {from_unit} = {result} {to_unit}")
         return f"{value} {from_unit} equals {result:.2f} {to_unit}"
 
+    def convert_units_bulk(self, values, from_unit, to_unit):
+        """Convert a sequence of values at once, returning a NumPy array.
+
+        Raises ValueError for unknown or incompatible units.
+        """
+        import numpy as np  # only bulk conversions need it, so keep it off the startup path
+        values = np.asarray(values, dtype=np.float64)
+        # Units usually arrive lowercase already; only lower() on a miss
+        if from_unit not in _UNIT_FACTORS:
+            from_unit = from_unit.lower()
+        if to_unit not in _UNIT_FACTORS:
+            to_unit = to_unit.lower()
+
+        # The temperature tables are plain arithmetic, so they apply elementwise
+        if from_unit in _TEMP_UNITS:
+            to_name = _TEMP_NORMALIZE.get(to_unit)
+            if not to_name:
+                raise ValueError(f"Unknown temperature unit: {to_unit}")
+            return _FROM_CELSIUS[to_name](_TO_CELSIUS[_TEMP_NORMALIZE[from_unit]](values))
+
+        from_factor = _UNIT_FACTORS.get(from_unit)
+        to_factor = _UNIT_FACTORS.get(to_unit)
+        if from_factor is None or to_factor is None:
+            raise ValueError(f"Cannot convert {from_unit} to {to_unit}")
+
+        # One scale factor applied across the whole array
+        return values * (from_factor / to_factor)
+
     def _convert_temperature(self, value, from_unit, to_unit):
         """Convert temperature units"""
-        from_unit = from_unit.lower()
-        to_unit = to_unit.lower()
-
-        # Normalize unit names
-        if from_unit in ['c', 'celsius']:
-            from_unit = 'celsius'
-        elif from_unit in ['f', 'fahrenheit']:
-            from_unit = 'fahrenheit'
-        elif from_unit in ['k', 'kelvin']:
-            from_unit = 'kelvin'
-
-        if to_unit in ['c', 'celsius']:
-            to_unit = 'celsius'
-        elif to_unit in ['f', 'fahrenheit']:
-            to_unit = 'fahrenheit'
-        elif to_unit in ['k', 'kelvin']:
-            to_unit = 'kelvin'
-
-        # Convert to Celsius first
-        if from_unit == 'celsius':
-            celsius = value
-        elif from_unit == 'fahrenheit':
-            celsius = (value - 32) * 5/9
-        elif from_unit == 'kelvin':
-            celsius = value - 273.15
-        else:
-            return f"Unknown temperature unit: {from_unit}"
-
-        # Convert from Celsius to target
-        if to_unit == 'celsius':
-            result = celsius
-        elif to_unit == 'fahrenheit':
-            result = (celsius * 9/5) + 32
-        elif to_unit == 'kelvin':
-            result = celsius + 273.15
-        else:
-            return f"Unknown temperature unit: {to_unit}"
-
-        logger.info(f"Temperature conversion: {value}° {from_unit} = {result}° {to_unit}")
-        return f"{value}° {from_unit} equals {result:.2f}° {to_unit}"
+        from_name = _TEMP_NORMALIZE.get(from_unit) or _TEMP_NORMALIZE.get(from_unit.lower())
+        to_name = _TEMP_NORMALIZE.get(to_unit) or _TEMP_NORMALIZE.get(to_unit.lower())
+
+        if not from_name:
+            return f"Unknown temperature unit: {from_unit.lower()}"
+        if not to_name:
+            return f"Unknown temperature unit: {to_unit.lower()}"
+
+        # Convert through Celsius
+        result = _FROM_CELSIUS[to_name](_TO_CELSIUS[from_name](value))
+
+        logger.info(f"Temperature conversion: {value}° {from_name} = {result}° {to_name}")
+        return f"{value}° {from_name} equals {result:.2f}° {to_name}"
+
+    def _get_fx_rates(self, base_currency):
+        """Rate table for base_currency, refetched at most every FX_CACHE_TTL seconds"""
+        # Using exchangerate-api.com (free tier)
+        url = f"https://api.exchangerate-api.com/v4/latest/{base_currency}"
+
+        return self._cached(('fx', base_currency), FX_CACHE_TTL,
+                            lambda: self._get_json(url).get('rates'))
 
     def convert_currency(self, amount, from_currency, to_currency):
         """Convert currency (using free exchange rate API)"""
@@ -358,17 +580,12 @@ class InfoManager:
         to_currency = to_currency.upper()
 
         try:
-            # Using exchangerate-api.com (free tier)
-            url = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
-
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            rates = self._get_fx_rates(from_currency)
 
-            if 'rates' not in data or to_currency not in data['rates']:
+            if rates is None or to_currency not in rates:
                 return f"Couldn't convert {from_currency} to {to_currency}"
 
-            rate = data['rates'][to_currency]
+            rate = rates[to_currency]
             result = amount * rate
 
             logger.info(f"Currency conversion: {amount} {from_currency} = {result} {to_currency}")
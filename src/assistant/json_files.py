@@ -0,0 +1,67 @@
+"""
+JSON file helpers shared by the managers that persist state - fast loads, atomic writes
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+# orjson is optional - much faster on the Pi, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files at least this large are parsed straight from an mmap (orjson only)
+MMAP_THRESHOLD = 64 * 1024
+
+# Write buffer for save_json_file; set PRETTY_JSON=1 for indented output
+JSON_WRITE_BUFFER = 1 << 16
+PRETTY_JSON = os.getenv('PRETTY_JSON') == '1'
+
+
+def load_json_file(file_path):
+    """Parse a JSON file, mapping large files instead of copying them in"""
+    file_path = Path(file_path)
+    if ORJSON_AVAILABLE and file_path.stat().st_size >= MMAP_THRESHOLD:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    raw = file_path.read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def dump_json(data, pretty=False, default=None):
+    """Serialize data to UTF-8 JSON bytes, compact unless pretty is set"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, default=default, indent=2).encode('utf-8')
+    return json.dumps(data, default=default, separators=(',', ':')).encode('utf-8')
+
+
+def save_json_file(file_path, data):
+    """Stream data to file_path as compact (or PRETTY_JSON) JSON through a large buffer"""
+    with open(file_path, 'w', buffering=JSON_WRITE_BUFFER) as f:
+        if PRETTY_JSON:
+            json.dump(data, f, indent=2)
+        else:
+            json.dump(data, f, separators=(',', ':'))
+
+
+def write_atomic(file_path, payload):
+    """Write bytes to a temp file beside file_path, then rename it into place.
+
+    The temp file is created like any other file, so the result keeps the
+    usual umask-based permissions.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
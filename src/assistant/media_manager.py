@@ -2,14 +2,65 @@
 Media Manager - Enhanced music search, podcast control, volume, Spotify/YouTube
 """
 
+import base64
 import os
 import json
 import logging
+import re
 import subprocess
+import threading
+import time
 import requests
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+from assistant.http_utils import check_response, create_session, parse_json
 
 logger = logging.getLogger(__name__)
 
+# pyalsaaudio is optional - in-process volume control, amixer otherwise
+try:
+    import alsaaudio
+    ALSAAUDIO_AVAILABLE = True
+except ImportError:
+    ALSAAUDIO_AVAILABLE = False
+
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
+
+# Seconds a search result is reused; album listings rarely change, podcast
+# results shift as new episodes come out
+ITUNES_CACHE_TTL = 600
+ALBUM_CACHE_TTL = 3600
+PODCAST_CACHE_TTL = 300
+STREAMING_CACHE_TTL = 600  # Spotify and YouTube
+
+# Seconds an expired iTunes result may still be served when the network fails
+ITUNES_STALE_TTL = 86400
+
+# Most search responses kept in memory
+SEARCH_CACHE_SIZE = 256
+
+# Seconds before a Spotify token's stated expiry that it's refreshed
+SPOTIFY_TOKEN_MARGIN = 60
+
+# Worker threads for searching several services at once
+_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix='media')
+
+# Seconds to wait for all services in a combined search
+FAN_OUT_TIMEOUT = 6
+
+# Spoken numbering for result lists
+_INDEX = ('1. ', '2. ', '3. ', '4. ', '5. ')
+
+# Volume percentage in `amixer get` output, e.g. "[62%]"
+_VOL_RE = re.compile(r'\[(\d+)%\]')
+
+
+def _format_results(heading, rows, template):
+    """Spoken result list: heading, then each row's fields numbered and filled into template"""
+    return " ".join([heading, *(_INDEX[i] + template.format(*row) for i, row in enumerate(rows))])
+
 
 class MediaManager:
     """Manage enhanced media features"""
@@ -21,46 +72,98 @@ class MediaManager:
         self.spotify_client_id = os.getenv('SPOTIFY_CLIENT_ID')
         self.spotify_client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
         self.spotify_token = None
+        self._spotify_token_expiry = 0  # time.monotonic() when the token needs refreshing
+        self._spotify_headers = None  # Bearer header for the current token
 
         # YouTube API key (optional)
         self.youtube_api_key = os.getenv('YOUTUBE_API_KEY')
 
+        # Shared session so repeat searches reuse connections, built on first use
+        self._http = None
+        self._http_lock = threading.Lock()
+
+        # ALSA Master mixer, opened on first volume command (False if unavailable)
+        self._mixer = None
+
+        # (service, args) -> (fetched at, parsed response), least recently used first
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         logger.info("Media Manager initialized")
 
+    @property
+    def http(self):
+        """Shared HTTP session, created on first request rather than at startup"""
+        if self._http is None:
+            with self._http_lock:  # search_all hits several services at once on pool threads
+                if self._http is None:
+                    self._http = create_session()
+        return self._http
+
+    def _cached(self, key, ttl, fetch, stale_ttl=0):
+        """Return fresh cached data for key, otherwise call fetch() and keep its result.
+
+        If fetch() fails with a network error, an expired entry younger than
+        stale_ttl seconds is returned instead.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and now - entry[0] < ttl:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        try:
+            data = fetch()
+        except requests.exceptions.RequestException as e:
+            if entry and now - entry[0] < stale_ttl:
+                logger.warning(f"Using stale {key[0]} result after network error: {e}")
+                return entry[1]
+            raise
+        with self._cache_lock:
+            self._cache[key] = (now, data)
+            self._cache.move_to_end(key)
+            if len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return data
+
+    def _itunes_get(self, params, ttl=ITUNES_CACHE_TTL):
+        """Run an iTunes search, reusing the response to an identical recent search"""
+        def fetch():
+            response = self.http.get(ITUNES_SEARCH_URL, params=params, timeout=5)
+            check_response(response)
+            return parse_json(response)
+
+        return self._cached(('itunes', tuple(sorted(params.items()))), ttl, fetch,
+                            stale_ttl=ITUNES_STALE_TTL)
+
     def search_song(self, query):
         """Search for a song using iTunes API (free, no auth needed)"""
         try:
             # iTunes Search API
-            url = "https://itunes.apple.com/search"
             params = {
                 'term': query,
                 'media': 'music',
                 'entity': 'song',
-                'limit': 5
+                'limit': 3  # only the top 3 are read out
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._itunes_get(params)
 
             if data.get('resultCount', 0) == 0:
                 return f"No songs found for '{query}'"
 
             # Get top results
-            results = data.get('results', [])[:3]
+            results = data.get('results', [])
 
-            result_text = f"Found {len(results)} songs for '{query}': "
-            for i, song in enumerate(results, 1):
-                artist = song.get('artistName', 'Unknown')
-                track = song.get('trackName', 'Unknown')
+            rows = []
+            for song in islice(results, 3):
                 album = song.get('collectionName', '')
-                result_text += f"{i}. {track} by {artist}"
-                if album:
-                    result_text += f" from {album}"
-                result_text += ". "
+                rows.append((song.get('trackName', 'Unknown'), song.get('artistName', 'Unknown'),
+                             f" from {album}" if album else ''))
 
             logger.info(f"Song search: {query}")
-            return result_text.strip()
+            return _format_results(f"Found {len(rows)} songs for '{query}':", rows, "{} by {}{}.")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Song search error: {e}")
@@ -70,34 +173,27 @@ class MediaManager:
         """Search for an artist and their popular songs"""
         try:
             # iTunes Search API
-            url = "https://itunes.apple.com/search"
             params = {
                 'term': artist_name,
                 'media': 'music',
                 'entity': 'song',
-                'limit': 5,
+                'limit': 3,
                 'attribute': 'artistTerm'
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._itunes_get(params)
 
             if data.get('resultCount', 0) == 0:
                 return f"No songs found for artist '{artist_name}'"
 
-            results = data.get('results', [])[:3]
+            results = data.get('results', [])
 
             if results:
                 artist = results[0].get('artistName', artist_name)
-                result_text = f"Popular songs by {artist}: "
-
-                for i, song in enumerate(results, 1):
-                    track = song.get('trackName', 'Unknown')
-                    result_text += f"{i}. {track}. "
+                rows = [(song.get('trackName', 'Unknown'),) for song in islice(results, 3)]
 
                 logger.info(f"Artist search: {artist_name}")
-                return result_text.strip()
+                return _format_results(f"Popular songs by {artist}:", rows, "{}.")
 
             return f"No songs found for '{artist_name}'"
 
@@ -108,7 +204,6 @@ class MediaManager:
     def search_album(self, album_name):
         """Search for an album"""
         try:
-            url = "https://itunes.apple.com/search"
             params = {
                 'term': album_name,
                 'media': 'music',
@@ -116,31 +211,23 @@ class MediaManager:
                 'limit': 3
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._itunes_get(params, ttl=ALBUM_CACHE_TTL)
 
             if data.get('resultCount', 0) == 0:
                 return f"No albums found for '{album_name}'"
 
-            results = data.get('results', [])[:3]
+            results = data.get('results', [])
 
-            result_text = f"Found {len(results)} albums: "
-            for i, album in enumerate(results, 1):
-                artist = album.get('artistName', 'Unknown')
-                name = album.get('collectionName', 'Unknown')
+            rows = []
+            for album in islice(results, 3):
                 year = album.get('releaseDate', '')[:4] if album.get('releaseDate') else ''
                 track_count = album.get('trackCount', '')
-
-                result_text += f"{i}. {name} by {artist}"
-                if year:
-                    result_text += f" ({year})"
-                if track_count:
-                    result_text += f", {track_count} tracks"
-                result_text += ". "
+                rows.append((album.get('collectionName', 'Unknown'), album.get('artistName', 'Unknown'),
+                             f" ({year})" if year else '',
+                             f", {track_count} tracks" if track_count else ''))
 
             logger.info(f"Album search: {album_name}")
-            return result_text.strip()
+            return _format_results(f"Found {len(rows)} albums:", rows, "{} by {}{}{}.")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Album search error: {e}")
@@ -149,52 +236,80 @@ class MediaManager:
     def search_podcast(self, query):
         """Search for podcasts using iTunes API"""
         try:
-            url = "https://itunes.apple.com/search"
             params = {
                 'term': query,
                 'media': 'podcast',
                 'entity': 'podcast',
-                'limit': 5
+                'limit': 3
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._itunes_get(params, ttl=PODCAST_CACHE_TTL)
 
             if data.get('resultCount', 0) == 0:
                 return f"No podcasts found for '{query}'"
 
-            results = data.get('results', [])[:3]
+            results = data.get('results', [])
 
-            result_text = f"Found {len(results)} podcasts: "
-            for i, podcast in enumerate(results, 1):
-                name = podcast.get('collectionName', 'Unknown')
-                artist = podcast.get('artistName', 'Unknown')
-                result_text += f"{i}. {name} by {artist}. "
+            rows = [(podcast.get('collectionName', 'Unknown'), podcast.get('artistName', 'Unknown'))
+                    for podcast in islice(results, 3)]
 
             logger.info(f"Podcast search: {query}")
-            return result_text.strip()
+            return _format_results(f"Found {len(rows)} podcasts:", rows, "{} by {}.")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Podcast search error: {e}")
             return "Couldn't search for podcasts."
 
+    def _get_mixer(self):
+        """ALSA Master mixer, opened on first use. None if pyalsaaudio or the control is unavailable."""
+        if self._mixer is None:
+            self._mixer = False
+            if ALSAAUDIO_AVAILABLE:
+                try:
+                    self._mixer = alsaaudio.Mixer('Master')
+                except alsaaudio.ALSAAudioError as e:
+                    logger.warning(f"ALSA mixer unavailable, using amixer: {e}")
+        return self._mixer or None
+
+    def _read_volume(self, mixer):
+        """Current Master volume percentage from an open mixer"""
+        mixer.handleevents()  # pick up changes made by other programs
+        return mixer.getvolume()[0]
+
+    def _amixer(self, *args):
+        """Run amixer with the given arguments, returning the completed process"""
+        return subprocess.run(
+            ['amixer', *args],
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+
+    def _amixer_set(self, *args):
+        """Run `amixer -q set Master ...`, returning True on success. Nothing is read back."""
+        return subprocess.run(
+            ['amixer', '-q', 'set', 'Master', *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=2
+        ).returncode == 0
+
     def get_volume(self):
         """Get current system volume (Linux/ALSA)"""
         try:
+            mixer = self._get_mixer()
+            if mixer:
+                volume = self._read_volume(mixer)
+                logger.info(f"Current volume: {volume}%")
+                return f"Volume is at {volume} percent"
+
             # Use amixer to get volume
-            result = subprocess.run(
-                ['amixer', 'get', 'Master'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
+            result = self._amixer('get', 'Master')
 
             if result.returncode == 0:
                 output = result.stdout
                 # Parse volume percentage
-                import re
-                match = re.search(r'\[(\d+)%\]', output)
+                match = _VOL_RE.search(output)
                 if match:
                     volume = match.group(1)
                     logger.info(f"Current volume: {volume}%")
@@ -212,20 +327,15 @@ class MediaManager:
             # Ensure level is between 0-100
             level = max(0, min(100, int(level)))
 
-            # Use amixer to set volume
-            result = subprocess.run(
-                ['amixer', 'set', 'Master', f'{level}%'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                logger.info(f"Volume set to {level}%")
-                return f"Volume set to {level} percent"
-            else:
+            mixer = self._get_mixer()
+            if mixer:
+                mixer.setvolume(level)
+            elif not self._amixer_set(f'{level}%'):
                 return "Couldn't set volume"
 
+            logger.info(f"Volume set to {level}%")
+            return f"Volume set to {level} percent"
+
         except Exception as e:
             logger.error(f"Set volume error: {e}")
             return "Couldn't set volume"
@@ -235,19 +345,15 @@ class MediaManager:
         try:
             amount = max(1, min(100, int(amount)))
 
-            result = subprocess.run(
-                ['amixer', 'set', 'Master', f'{amount}%+'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                logger.info(f"Volume increased by {amount}%")
-                return f"Volume increased by {amount} percent"
-            else:
+            mixer = self._get_mixer()
+            if mixer:
+                mixer.setvolume(min(100, self._read_volume(mixer) + amount))
+            elif not self._amixer_set(f'{amount}%+'):
                 return "Couldn't increase volume"
 
+            logger.info(f"Volume increased by {amount}%")
+            return f"Volume increased by {amount} percent"
+
         except Exception as e:
             logger.error(f"Volume up error: {e}")
             return "Couldn't increase volume"
@@ -257,19 +363,15 @@ class MediaManager:
         try:
             amount = max(1, min(100, int(amount)))
 
-            result = subprocess.run(
-                ['amixer', 'set', 'Master', f'{amount}%-'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                logger.info(f"Volume decreased by {amount}%")
-                return f"Volume decreased by {amount} percent"
-            else:
+            mixer = self._get_mixer()
+            if mixer:
+                mixer.setvolume(max(0, self._read_volume(mixer) - amount))
+            elif not self._amixer_set(f'{amount}%-'):
                 return "Couldn't decrease volume"
 
+            logger.info(f"Volume decreased by {amount}%")
+            return f"Volume decreased by {amount} percent"
+
         except Exception as e:
             logger.error(f"Volume down error: {e}")
             return "Couldn't decrease volume"
@@ -277,19 +379,15 @@ class MediaManager:
     def mute_audio(self):
         """Mute audio"""
         try:
-            result = subprocess.run(
-                ['amixer', 'set', 'Master', 'mute'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                logger.info("Audio muted")
-                return "Audio muted"
-            else:
+            mixer = self._get_mixer()
+            if mixer:
+                mixer.setmute(1)
+            elif not self._amixer_set('mute'):
                 return "Couldn't mute audio"
 
+            logger.info("Audio muted")
+            return "Audio muted"
+
         except Exception as e:
             logger.error(f"Mute error: {e}")
             return "Couldn't mute audio"
@@ -297,19 +395,15 @@ class MediaManager:
     def unmute_audio(self):
         """Unmute audio"""
         try:
-            result = subprocess.run(
-                ['amixer', 'set', 'Master', 'unmute'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                logger.info("Audio unmuted")
-                return "Audio unmuted"
-            else:
+            mixer = self._get_mixer()
+            if mixer:
+                mixer.setmute(0)
+            elif not self._amixer_set('unmute'):
                 return "Couldn't unmute audio"
 
+            logger.info("Audio unmuted")
+            return "Audio unmuted"
+
         except Exception as e:
             logger.error(f"Unmute error: {e}")
             return "Couldn't unmute audio"
@@ -327,39 +421,41 @@ class MediaManager:
                 'key': self.youtube_api_key,
                 'type': 'video',
                 'maxResults': 3,
-                'videoCategoryId': '10'  # Music category
+                'videoCategoryId': '10',  # Music category
+                'fields': 'items(snippet(title,channelTitle))'  # only what gets read out
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            def fetch():
+                response = self.http.get(url, params=params, timeout=5)
+                check_response(response)
+                return parse_json(response)
+
+            data = self._cached(('youtube', query), STREAMING_CACHE_TTL, fetch)
 
             if 'items' not in data or len(data['items']) == 0:
                 return f"No YouTube videos found for '{query}'"
 
-            results = data['items'][:3]
+            results = data['items']
 
-            result_text = f"Found {len(results)} YouTube videos: "
-            for i, video in enumerate(results, 1):
-                title = video['snippet']['title']
-                channel = video['snippet']['channelTitle']
-                result_text += f"{i}. {title} by {channel}. "
+            rows = [(video['snippet']['title'], video['snippet']['channelTitle'])
+                    for video in islice(results, 3)]
 
             logger.info(f"YouTube search: {query}")
-            return result_text.strip()
+            return _format_results(f"Found {len(rows)} YouTube videos:", rows, "{} by {}.")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"YouTube search error: {e}")
             return "Couldn't search YouTube."
 
     def get_spotify_token(self):
-        """Get Spotify access token using client credentials flow"""
+        """Get Spotify access token using client credentials flow, reusing it until it's about to expire"""
         if not self.spotify_client_id or not self.spotify_client_secret:
             return None
 
-        try:
-            import base64
+        if self.spotify_token and time.monotonic() < self._spotify_token_expiry:
+            return self.spotify_token
 
+        try:
             # Encode credentials
             credentials = f"{self.spotify_client_id}:{self.spotify_client_secret}"
             credentials_b64 = base64.b64encode(credentials.encode()).decode()
@@ -372,11 +468,14 @@ class MediaManager:
             }
             data = {'grant_type': 'client_credentials'}
 
-            response = requests.post(url, headers=headers, data=data, timeout=5)
-            response.raise_for_status()
+            response = self.http.post(url, headers=headers, data=data, timeout=5)
+            check_response(response)
 
-            token_data = response.json()
+            token_data = parse_json(response)
             self.spotify_token = token_data.get('access_token')
+            self._spotify_headers = {'Authorization': f'Bearer {self.spotify_token}'}
+            expires_in = token_data.get('expires_in', 3600)
+            self._spotify_token_expiry = time.monotonic() + expires_in - SPOTIFY_TOKEN_MARGIN
 
             logger.info("Spotify token acquired")
             return self.spotify_token
@@ -385,63 +484,87 @@ class MediaManager:
             logger.error(f"Spotify token error: {e}")
             return None
 
+    def _spotify_get(self, url, params):
+        """GET from the Spotify API, fetching a new token and retrying once on 401"""
+        response = self.http.get(url, headers=self._spotify_headers, params=params, timeout=5)
+        if response.status_code == 401:
+            logger.info("Spotify token rejected, refreshing")
+            self._spotify_token_expiry = 0
+            if self.get_spotify_token():
+                response = self.http.get(url, headers=self._spotify_headers, params=params, timeout=5)
+        check_response(response)
+        return parse_json(response)
+
     def search_spotify(self, query, search_type='track'):
         """Search Spotify (requires Spotify API credentials)"""
         if not self.spotify_client_id or not self.spotify_client_secret:
             return "Spotify search not configured. Set SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET."
 
-        # Get token if we don't have one
-        if not self.spotify_token:
-            self.get_spotify_token()
-
-        if not self.spotify_token:
+        # Get token if we don't have one or it's expiring
+        if not self.get_spotify_token():
             return "Couldn't authenticate with Spotify."
 
         try:
             url = "https://api.spotify.com/v1/search"
-            headers = {'Authorization': f'Bearer {self.spotify_token}'}
             params = {
                 'q': query,
                 'type': search_type,
                 'limit': 3
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._cached(('spotify', query, search_type), STREAMING_CACHE_TTL,
+                                lambda: self._spotify_get(url, params))
 
             if search_type == 'track':
                 tracks = data.get('tracks', {}).get('items', [])
                 if not tracks:
                     return f"No Spotify tracks found for '{query}'"
 
-                result_text = f"Found {len(tracks)} Spotify tracks: "
-                for i, track in enumerate(tracks, 1):
-                    name = track['name']
-                    artists = ', '.join([artist['name'] for artist in track['artists']])
-                    result_text += f"{i}. {name} by {artists}. "
+                rows = [(track['name'], ', '.join([artist['name'] for artist in track['artists']]))
+                        for track in islice(tracks, 3)]
 
                 logger.info(f"Spotify search: {query}")
-                return result_text.strip()
+                return _format_results(f"Found {len(rows)} Spotify tracks:", rows, "{} by {}.")
 
             elif search_type == 'artist':
                 artists = data.get('artists', {}).get('items', [])
                 if not artists:
                     return f"No Spotify artists found for '{query}'"
 
-                result_text = f"Found {len(artists)} Spotify artists: "
-                for i, artist in enumerate(artists, 1):
-                    name = artist['name']
-                    genres = ', '.join(artist.get('genres', [])[:2])
-                    result_text += f"{i}. {name}"
-                    if genres:
-                        result_text += f" ({genres})"
-                    result_text += ". "
+                rows = []
+                for artist in islice(artists, 3):
+                    genres = ', '.join(islice(artist.get('genres', ()), 2))
+                    rows.append((artist['name'], f" ({genres})" if genres else ''))
 
-                return result_text.strip()
+                return _format_results(f"Found {len(rows)} Spotify artists:", rows, "{}{}.")
 
             return "Search completed"
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Spotify search error: {e}")
             return "Couldn't search Spotify."
+
+    def search_all(self, query):
+        """Search iTunes plus any configured Spotify/YouTube for query, all at once"""
+        searches = [('iTunes', self.search_song)]
+        if self.spotify_client_id and self.spotify_client_secret:
+            searches.append(('Spotify', self.search_spotify))
+        if self.youtube_api_key:
+            searches.append(('YouTube', self.search_youtube))
+
+        futures = [(name, _EXECUTOR.submit(search, query)) for name, search in searches]
+
+        # One deadline for the whole search rather than per service
+        deadline = time.monotonic() + FAN_OUT_TIMEOUT
+        results = []
+        for name, future in futures:
+            try:
+                results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+            except FuturesTimeoutError:
+                logger.error(f"{name} search timed out for: {query}")
+
+        if not results:
+            return f"Couldn't search for '{query}' right now. Try again in a moment."
+
+        logger.info(f"Search across services: {query}")
+        return " ".join(results)
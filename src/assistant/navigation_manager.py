@@ -4,11 +4,49 @@ Navigation Manager - Directions, location, nearby places, distance calculations
 
 import os
 import logging
+import re
+import threading
+import time
 import requests
 import math
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from assistant.http_utils import check_response, create_session, parse_json
 
 logger = logging.getLogger(__name__)
 
+# HTML tags in Google Directions step instructions
+_HTML_TAG_RE = re.compile(r'<[^<]+?>')
+
+# Compass points, clockwise from north in 45 degree steps
+_COMPASS_POINTS = ('north', 'northeast', 'east', 'southeast', 'south', 'southwest', 'west', 'northwest')
+
+# Seconds a geocoding result is reused; places don't move, and Nominatim's
+# usage policy asks clients to cache
+GEOCODE_CACHE_TTL = 86400
+
+# Seconds an IP location lookup is reused
+LOCATION_CACHE_TTL = 300
+
+# Seconds an expired location or geocode may still be served when the network
+# fails (spotty or captive-portal Wi-Fi)
+LOCATION_STALE_TTL = 86400
+GEOCODE_STALE_TTL = 86400 * 7
+
+# Seconds a nearby-places search is reused
+NEARBY_CACHE_TTL = 3600
+
+# Most geocoding and places results kept in memory
+LOOKUP_CACHE_SIZE = 512
+
+# Coordinates closer than this (summed degrees, ~10 m) count as the same place
+SAME_PLACE_DEGREES = 1e-4
+
+# Worker threads for geocoding both ends of a trip at once
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='navigation')
+
 
 class NavigationManager:
     """Manage navigation and location features"""
@@ -25,15 +63,60 @@ class NavigationManager:
         # User agent for Nominatim (required)
         self.user_agent = "SmartGlasses/1.0"
 
+        # Shared session so repeat lookups reuse connections, built on first use
+        self._http = None
+        self._http_lock = threading.Lock()
+
+        # (kind, address or rounded coords) -> (fetched at, result), least recently used first
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         logger.info("Navigation Manager initialized")
 
+    @property
+    def http(self):
+        """Shared HTTP session, created on first request rather than at startup"""
+        if self._http is None:
+            with self._http_lock:  # both ends of a trip are geocoded at once on pool threads
+                if self._http is None:
+                    session = create_session()
+                    session.headers['User-Agent'] = self.user_agent  # sent on every Nominatim request
+                    self._http = session
+        return self._http
+
+    def _cached(self, key, ttl, fetch, stale_ttl=0):
+        """Return fresh cached data for key, otherwise call fetch() and keep its result.
+
+        If fetch() fails with a network error, an expired entry younger than
+        stale_ttl seconds is returned instead.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and now - entry[0] < ttl:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        try:
+            data = fetch()
+        except requests.exceptions.RequestException as e:
+            if entry and now - entry[0] < stale_ttl:
+                logger.warning(f"Using stale {key[0]} result after network error: {e}")
+                return entry[1]
+            raise
+        if data is not None:
+            with self._cache_lock:
+                self._cache[key] = (now, data)
+                self._cache.move_to_end(key)
+                if len(self._cache) > LOOKUP_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return data
+
     def get_current_location(self):
         """Get current location using IP geolocation (approximate)"""
         try:
-            # Using ip-api.com (free, no key needed)
-            response = requests.get("http://ip-api.com/json/", timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = self._cached(('location',), LOCATION_CACHE_TTL, self._fetch_ip_location,
+                                stale_ttl=LOCATION_STALE_TTL)
 
             if data.get('status') == 'success':
                 city = data.get('city', 'Unknown')
@@ -57,63 +140,86 @@ class NavigationManager:
             logger.error(f"Location error: {e}")
             return "Couldn't determine current location"
 
+    def _fetch_ip_location(self):
+        """Look up this device's approximate location from its IP address"""
+        # Using ip-api.com (free, no key needed)
+        response = self.http.get("http://ip-api.com/json/", timeout=5)
+        check_response(response)
+        return parse_json(response)
+
     def geocode_address(self, address):
         """Convert address to coordinates using Nominatim"""
         try:
-            url = f"{self.nominatim_url}/search"
-            params = {
-                'q': address,
-                'format': 'json',
-                'limit': 1
-            }
-            headers = {'User-Agent': self.user_agent}
-
-            response = requests.get(url, params=params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            if data and len(data) > 0:
-                result = data[0]
-                lat = float(result['lat'])
-                lon = float(result['lon'])
-                display_name = result.get('display_name', address)
-
-                return {
-                    'lat': lat,
-                    'lon': lon,
-                    'name': display_name
-                }
-
-            return None
+            return self._cached(('geocode', address.strip().lower()), GEOCODE_CACHE_TTL,
+                                lambda: self._fetch_geocode(address), stale_ttl=GEOCODE_STALE_TTL)
 
         except Exception as e:
             logger.error(f"Geocoding error: {e}")
             return None
 
-    def reverse_geocode(self, lat, lon):
-        """Convert coordinates to address"""
-        try:
-            url = f"{self.nominatim_url}/reverse"
-            params = {
+    def _fetch_geocode(self, address):
+        """Look up an address with Nominatim, returning lat/lon/name or None"""
+        url = f"{self.nominatim_url}/search"
+        params = {
+            'q': address,
+            'format': 'json',
+            'limit': 1
+        }
+        response = self.http.get(url, params=params, timeout=5)
+        check_response(response)
+        data = parse_json(response)
+
+        if data and len(data) > 0:
+            result = data[0]
+            lat = float(result['lat'])
+            lon = float(result['lon'])
+            display_name = result.get('display_name', address)
+
+            return {
                 'lat': lat,
                 'lon': lon,
-                'format': 'json'
+                'name': display_name
             }
-            headers = {'User-Agent': self.user_agent}
 
-            response = requests.get(url, params=params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+        return None
 
-            if 'display_name' in data:
-                return data['display_name']
+    def _geocode_pair(self, first, second):
+        """Geocode two addresses concurrently, returning both results"""
+        if first.strip().lower() == second.strip().lower():
+            coords = self.geocode_address(first)
+            return coords, coords
 
-            return None
+        pending = _EXECUTOR.submit(self.geocode_address, second)
+        return self.geocode_address(first), pending.result()
+
+    def reverse_geocode(self, lat, lon):
+        """Convert coordinates to address"""
+        try:
+            # ~1 m precision, so GPS jitter still hits the cache
+            key = ('reverse', round(float(lat), 5), round(float(lon), 5))
+            return self._cached(key, GEOCODE_CACHE_TTL, lambda: self._fetch_reverse_geocode(lat, lon))
 
         except Exception as e:
             logger.error(f"Reverse geocoding error: {e}")
             return None
 
+    def _fetch_reverse_geocode(self, lat, lon):
+        """Look up the address at coordinates with Nominatim, or None"""
+        url = f"{self.nominatim_url}/reverse"
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'format': 'json'
+        }
+        response = self.http.get(url, params=params, timeout=5)
+        check_response(response)
+        data = parse_json(response)
+
+        if 'display_name' in data:
+            return data['display_name']
+
+        return None
+
     def get_directions(self, origin, destination):
         """Get directions between two locations"""
         if self.google_maps_api_key:
@@ -132,9 +238,9 @@ class NavigationManager:
                 'mode': 'driving'
             }
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            response = self.http.get(url, params=params, timeout=5)
+            check_response(response)
+            data = parse_json(response)
 
             if data.get('status') != 'OK' or 'routes' not in data or len(data['routes']) == 0:
                 return f"Couldn't get directions from {origin} to {destination}"
@@ -148,21 +254,21 @@ class NavigationManager:
             end = leg['end_address']
 
             # Get first few steps
-            steps = leg.get('steps', [])[:3]
-            directions_text = f"Directions from {start} to {end}. "
-            directions_text += f"Total distance: {distance}, estimated time: {duration}. "
+            steps = leg.get('steps', [])
+            parts = [
+                f"Directions from {start} to {end}.",
+                f"Total distance: {distance}, estimated time: {duration}."
+            ]
 
             if steps:
-                directions_text += "First steps: "
-                for i, step in enumerate(steps, 1):
-                    instruction = step['html_instructions']
+                parts.append("First steps:")
+                for i, step in enumerate(islice(steps, 3), 1):
                     # Remove HTML tags
-                    import re
-                    instruction = re.sub('<[^<]+?>', '', instruction)
-                    directions_text += f"{i}. {instruction}. "
+                    instruction = _HTML_TAG_RE.sub('', step['html_instructions'])
+                    parts.append(f"{i}. {instruction}.")
 
             logger.info(f"Directions: {origin} to {destination}")
-            return directions_text.strip()
+            return " ".join(parts)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Directions API error: {e}")
@@ -170,24 +276,18 @@ class NavigationManager:
 
     def _get_directions_basic(self, origin, destination):
         """Get basic directions without Google Maps (just distance/bearing)"""
-        origin_coords = self.geocode_address(origin)
-        dest_coords = self.geocode_address(destination)
+        origin_coords, dest_coords = self._geocode_pair(origin, destination)
 
         if not origin_coords or not dest_coords:
             return f"Couldn't find locations for directions. Set GOOGLE_MAPS_API_KEY for full directions."
 
-        distance_km = self.calculate_distance(
+        distance_km, bearing = self._haversine_and_bearing(
             origin_coords['lat'], origin_coords['lon'],
             dest_coords['lat'], dest_coords['lon']
         )
 
         distance_mi = distance_km * 0.621371
 
-        bearing = self.calculate_bearing(
-            origin_coords['lat'], origin_coords['lon'],
-            dest_coords['lat'], dest_coords['lon']
-        )
-
         direction_text = f"From {origin} to {destination}: "
         direction_text += f"approximately {distance_mi:.1f} miles ({distance_km:.1f} km) "
         direction_text += f"heading {bearing}. "
@@ -207,8 +307,10 @@ class NavigationManager:
 
         try:
             url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+            # Rounded to ~100 m so searches from about the same spot share a cache entry
+            lat, lon = round(coords['lat'], 3), round(coords['lon'], 3)
             params = {
-                'location': f"{coords['lat']},{coords['lon']}",
+                'location': f"{lat},{lon}",
                 'radius': 1000,  # 1km radius
                 'key': self.google_maps_api_key
             }
@@ -216,34 +318,46 @@ class NavigationManager:
             if place_type:
                 params['type'] = place_type
 
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            def fetch():
+                response = self.http.get(url, params=params, timeout=5)
+                check_response(response)
+                return parse_json(response)
+
+            data = self._cached(('nearby', lat, lon, place_type), NEARBY_CACHE_TTL, fetch)
 
             if data.get('status') != 'OK' or 'results' not in data:
                 return f"No nearby places found"
 
-            results = data['results'][:5]
-
-            result_text = f"Found {len(results)} nearby places"
+            # Closest first, measured from the searched location
+            results = data['results']
+            nan = float('nan')  # no coordinates: sorts last
+            points = [place.get('geometry', {}).get('location', {}) for place in results]
+            distances = self.calculate_distances(
+                coords['lat'], coords['lon'],
+                [point.get('lat', nan) for point in points],
+                [point.get('lng', nan) for point in points]
+            )
+            results = [results[i] for i in distances.argsort(kind='stable')[:5]]
+
+            heading = f"Found {len(results)} nearby places"
             if place_type:
-                result_text += f" (type: {place_type})"
-            result_text += ": "
+                heading += f" (type: {place_type})"
+            parts = [heading + ":"]
 
             for i, place in enumerate(results, 1):
                 name = place.get('name', 'Unknown')
                 vicinity = place.get('vicinity', '')
                 rating = place.get('rating', '')
 
-                result_text += f"{i}. {name}"
+                entry = f"{i}. {name}"
                 if vicinity:
-                    result_text += f" at {vicinity}"
+                    entry += f" at {vicinity}"
                 if rating:
-                    result_text += f", rated {rating} stars"
-                result_text += ". "
+                    entry += f", rated {rating} stars"
+                parts.append(entry + ".")
 
             logger.info(f"Nearby places: {location}, type: {place_type}")
-            return result_text.strip()
+            return " ".join(parts)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Nearby places error: {e}")
@@ -271,6 +385,22 @@ class NavigationManager:
 
         return distance
 
+    def calculate_distances(self, lat0, lon0, lats, lons):
+        """Distances in kilometers from one point to many, as a NumPy array (Haversine formula)"""
+        import numpy as np  # only batch distances need it, so keep it off the startup path
+
+        # Earth radius in kilometers
+        R = 6371.0
+
+        # Origin converted once, the rest in one pass
+        lat0_rad = math.radians(lat0)
+        lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+        dlat = lats_rad - lat0_rad
+        dlon = np.radians(np.asarray(lons, dtype=np.float64) - lon0)
+
+        a = np.sin(dlat / 2)**2 + math.cos(lat0_rad) * np.cos(lats_rad) * np.sin(dlon / 2)**2
+        return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
     def calculate_bearing(self, lat1, lon1, lat2, lon2):
         """Calculate compass bearing between two points"""
         lat1_rad = math.radians(lat1)
@@ -285,21 +415,43 @@ class NavigationManager:
         bearing_deg = (bearing_deg + 360) % 360
 
         # Convert to compass direction
-        directions = ['north', 'northeast', 'east', 'southeast', 'south', 'southwest', 'west', 'northwest']
-        index = round(bearing_deg / 45) % 8
+        return _COMPASS_POINTS[round(bearing_deg / 45) % 8]
 
-        return directions[index]
+    def _haversine_and_bearing(self, lat1, lon1, lat2, lon2):
+        """Distance in kilometers and compass direction between two points, sharing the trig between them"""
+        # Earth radius in kilometers
+        R = 6371.0
+
+        lat1_rad = math.radians(lat1)
+        lat2_rad = math.radians(lat2)
+        dlat_rad = lat2_rad - lat1_rad
+        dlon_rad = math.radians(lon2 - lon1)
+        sin_lat1, cos_lat1 = math.sin(lat1_rad), math.cos(lat1_rad)
+        sin_lat2, cos_lat2 = math.sin(lat2_rad), math.cos(lat2_rad)
+
+        # Haversine formula
+        a = math.sin(dlat_rad / 2)**2 + cos_lat1 * cos_lat2 * math.sin(dlon_rad / 2)**2
+        distance = R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+        # Initial bearing
+        y = math.sin(dlon_rad) * cos_lat2
+        x = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * math.cos(dlon_rad)
+        bearing_deg = (math.degrees(math.atan2(y, x)) + 360) % 360
+
+        return distance, _COMPASS_POINTS[round(bearing_deg / 45) % 8]
 
     def get_distance_between(self, location1, location2):
         """Get distance between two locations"""
-        coords1 = self.geocode_address(location1)
-        coords2 = self.geocode_address(location2)
+        coords1, coords2 = self._geocode_pair(location1, location2)
 
         if not coords1:
             return f"Couldn't find location: {location1}"
         if not coords2:
             return f"Couldn't find location: {location2}"
 
+        if abs(coords1['lat'] - coords2['lat']) + abs(coords1['lon'] - coords2['lon']) < SAME_PLACE_DEGREES:
+            return f"{location1} and {location2} are essentially the same location."
+
         distance_km = self.calculate_distance(
             coords1['lat'], coords1['lon'],
             coords2['lat'], coords2['lon']
@@ -2,13 +2,20 @@
 Productivity Manager - Handle notes, reminders, todos, and shopping lists
 """
 
+import atexit
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from assistant.json_files import save_json_file
+
 logger = logging.getLogger(__name__)
 
+# Seconds to batch list changes before writing them to disk
+FLUSH_DELAY = 5
+
 
 class ProductivityManager:
     """Manage productivity features: notes, reminders, todos, shopping lists"""
@@ -23,12 +30,38 @@ class ProductivityManager:
         self.shopping_list_file = self.data_dir / 'shopping_list.json'
         self.todos_file = self.data_dir / 'todos.json'
 
+        # Writes are batched and flushed by a timer
+        self._flush_lock = threading.Lock()
+        self._pending_writes = {}
+        self._flush_timer = None
+        atexit.register(self.flush)
+
         # Load data
         self.notes = self._load_json(self.notes_file, [])
         self.reminders = self._load_json(self.reminders_file, [])
         self.shopping_list = self._load_json(self.shopping_list_file, [])
         self.todos = self._load_json(self.todos_file, [])
 
+        # Fast duplicate check for the shopping list
+        self._shopping_set = set(self.shopping_list)
+
+        # Todos by id, and the pending todos/reminders in the order they were added
+        self._todos_by_id = {}
+        self._next_todo_id = max((t['id'] for t in self.todos if isinstance(t['id'], int)), default=0) + 1
+        renumbered = False
+        for todo in self.todos:
+            if todo['id'] in self._todos_by_id:
+                # Older files could repeat ids; renumber so every todo can be completed
+                logger.warning(f"Renumbering duplicate todo id {todo['id']} to {self._next_todo_id}")
+                todo['id'] = self._next_todo_id
+                self._next_todo_id += 1
+                renumbered = True
+            self._todos_by_id[todo['id']] = todo
+        if renumbered:
+            self._schedule_save(self.todos_file, self.todos)
+        self._active_todos = {t['id']: t for t in self.todos if not t['completed']}
+        self._active_reminders = [r for r in self.reminders if not r['completed']]
+
         logger.info("Productivity Manager initialized")
 
     def _load_json(self, file_path, default):
@@ -41,25 +74,44 @@ class ProductivityManager:
             logger.error(f"Error loading {file_path}: {e}")
         return default
 
+    def _schedule_save(self, file_path, data):
+        """Queue data to be written to file_path on the next flush"""
+        with self._flush_lock:
+            self._pending_writes[file_path] = data
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write any queued changes to disk"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending_writes = self._pending_writes, {}
+            for file_path, data in pending.items():
+                self._save_json(file_path, data)
+
     def _save_json(self, file_path, data):
         """Save data to JSON file"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            save_json_file(file_path, data)
         except Exception as e:
             logger.error(f"Error saving {file_path}: {e}")
 
     # NOTES
     def add_note(self, note_text):
         """Add a voice note"""
+        now = datetime.now()
         note = {
             'id': len(self.notes) + 1,
             'text': note_text,
-            'timestamp': datetime.now().isoformat(),
-            'date': datetime.now().strftime('%Y-%m-%d %I:%M %p')
+            'timestamp': now.isoformat(),
+            'date': now.strftime('%Y-%m-%d %I:%M %p')
         }
         self.notes.append(note)
-        self._save_json(self.notes_file, self.notes)
+        self._schedule_save(self.notes_file, self.notes)
         logger.info(f"Note added: {note_text[:50]}...")
         return f"Note saved: {note_text}"
 
@@ -84,13 +136,14 @@ class ProductivityManager:
             'completed': False
         }
         self.reminders.append(reminder)
-        self._save_json(self.reminders_file, self.reminders)
+        self._active_reminders.append(reminder)
+        self._schedule_save(self.reminders_file, self.reminders)
         logger.info(f"Reminder added: {task} at {time_str}")
         return f"Reminder set: {task} at {time_str}"
 
     def get_reminders(self):
         """Get active reminders"""
-        active = [r for r in self.reminders if not r['completed']]
+        active = self._active_reminders
         if not active:
             return "You have no reminders set"
 
@@ -105,11 +158,12 @@ class ProductivityManager:
         items = [item.strip() for item in items_str.split(',')]
         added = []
         for item in items:
-            if item and item not in self.shopping_list:
+            if item and item not in self._shopping_set:
                 self.shopping_list.append(item)
+                self._shopping_set.add(item)
                 added.append(item)
 
-        self._save_json(self.shopping_list_file, self.shopping_list)
+        self._schedule_save(self.shopping_list_file, self.shopping_list)
 
         if added:
             logger.info(f"Added to shopping list: {', '.join(added)}")
@@ -130,27 +184,31 @@ class ProductivityManager:
     def clear_shopping_list(self):
         """Clear shopping list"""
         self.shopping_list = []
-        self._save_json(self.shopping_list_file, self.shopping_list)
+        self._shopping_set.clear()
+        self._schedule_save(self.shopping_list_file, self.shopping_list)
         return "Shopping list cleared"
 
     # TODOS
     def add_todo(self, task, priority='medium'):
         """Add a todo item"""
         todo = {
-            'id': len(self.todos) + 1,
+            'id': self._next_todo_id,
             'task': task,
             'priority': priority,
             'created': datetime.now().isoformat(),
             'completed': False
         }
         self.todos.append(todo)
-        self._save_json(self.todos_file, self.todos)
+        self._next_todo_id += 1
+        self._todos_by_id[todo['id']] = todo
+        self._active_todos[todo['id']] = todo
+        self._schedule_save(self.todos_file, self.todos)
         logger.info(f"Todo added: {task} (priority: {priority})")
         return f"Added to todos: {task} (priority: {priority})"
 
     def get_todos(self):
         """Get active todos"""
-        active = [t for t in self.todos if not t['completed']]
+        active = self._active_todos.values()
         if not active:
             return "You have no pending tasks"
 
@@ -162,9 +220,10 @@ class ProductivityManager:
 
     def complete_todo(self, task_id):
         """Mark todo as completed"""
-        for todo in self.todos:
-            if todo['id'] == task_id:
-                todo['completed'] = True
-                self._save_json(self.todos_file, self.todos)
-                return f"Task completed: {todo['task']}"
-        return "Task not found"
+        todo = self._todos_by_id.get(task_id)
+        if todo is None:
+            return "Task not found"
+        todo['completed'] = True
+        self._active_todos.pop(task_id, None)
+        self._schedule_save(self.todos_file, self.todos)
+        return f"Task completed: {todo['task']}"
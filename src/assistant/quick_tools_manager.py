@@ -2,13 +2,110 @@
 Quick Tools Manager - Calculator, age calculator, countdown, random generators
 """
 
+import ast
 import logging
+import math
+import operator
 import random
+from functools import lru_cache
 from datetime import datetime, timedelta
 import re
 
 logger = logging.getLogger(__name__)
 
+# Operators the calculator accepts, by AST node type
+_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Most decimal digits a '**' result may have. Each power's size is estimated
+# before it is computed, so no power ever builds a bigger number; the other
+# operators only grow results in proportion to the expression's length
+MAX_POWER_DIGITS = 1000
+
+# Distinct expressions whose result is remembered
+CALC_CACHE_SIZE = 128
+
+# Distinct compound interest inputs whose result is remembered
+INTEREST_CACHE_SIZE = 512
+
+# Date formats tried after the ISO fast path, in order
+_AGE_FORMATS = (
+    '%Y-%m-%d',   # 2000-01-15
+    '%m/%d/%Y',   # 01/15/2000
+    '%d/%m/%Y',   # 15/01/2000
+    '%B %d, %Y',  # January 15, 2000
+    '%b %d, %Y',  # Jan 15, 2000
+)
+_COUNTDOWN_FORMATS = (
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%B %d',      # December 25 (assumes current year)
+    '%b %d',      # Dec 25
+)
+_DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y')
+
+# Distinct date strings whose parse result is remembered
+DATE_CACHE_SIZE = 256
+
+
+def _eval_node(node):
+    """Evaluate an arithmetic AST node, rejecting anything but numbers and _OPS"""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        # Only a base above 1 raised to a positive power can grow (the real part
+        # decides for complex exponents), so tiny results like 10**-5000 pass
+        if isinstance(node.op, ast.Pow) and abs(left) > 1 and right.real > 0:
+            # log10 of the result's magnitude, i.e. roughly its digit count
+            digits = right.real * math.log10(abs(left))
+            if digits > MAX_POWER_DIGITS:
+                raise ValueError(f"Result too large: about {digits:.0f} digits")
+        return _OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=CALC_CACHE_SIZE)
+def _evaluate(expression):
+    """Parse and evaluate a cleaned arithmetic expression"""
+    return _eval_node(ast.parse(expression, mode='eval').body)
+
+
+@lru_cache(maxsize=INTEREST_CACHE_SIZE)
+def _compound(p, r, t):
+    """Amount after t years of annual compounding: A = P(1 + r)^t"""
+    return p * ((1 + r) ** t)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(date_str, formats):
+    """Parse an ISO date, else the first of formats that matches; None if none do"""
+    try:
+        # Keep the written date and time; the callers compare with naive datetime.now()
+        return datetime.fromisoformat(date_str).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
 
 class QuickToolsManager:
     """Manage quick utility tools"""
@@ -23,13 +120,12 @@ class QuickToolsManager:
             # Remove any potentially dangerous characters
             # Only allow numbers, operators, parentheses, and basic functions
             allowed_chars = set('0123456789+-*/().% ')
-            cleaned = ''.join(c for c in expression if c in allowed_chars)
+            cleaned = ''.join(c for c in expression if c in allowed_chars).strip()
 
             if not cleaned:
                 return "Invalid calculation expression"
 
-            # Use eval with restricted globals/locals for safety
-            result = eval(cleaned, {"__builtins__": {}}, {})
+            result = _evaluate(cleaned)
 
             logger.info(f"Calculation: {expression} = {result}")
             return f"{expression} equals {result}"
@@ -43,22 +139,7 @@ class QuickToolsManager:
     def calculate_age(self, birthdate_str):
         """Calculate age from birthdate"""
         try:
-            # Try to parse various date formats
-            formats = [
-                '%Y-%m-%d',   # 2000-01-15
-                '%m/%d/%Y',   # 01/15/2000
-                '%d/%m/%Y',   # 15/01/2000
-                '%B %d, %Y',  # January 15, 2000
-                '%b %d, %Y',  # Jan 15, 2000
-            ]
-
-            birthdate = None
-            for fmt in formats:
-                try:
-                    birthdate = datetime.strptime(birthdate_str, fmt)
-                    break
-                except ValueError:
-                    continue
+            birthdate = _parse_date(birthdate_str, _AGE_FORMATS)
 
             if not birthdate:
                 return f"Couldn't parse date '{birthdate_str}'. Try format: YYYY-MM-DD or MM/DD/YYYY"
@@ -91,33 +172,18 @@ class QuickToolsManager:
     def days_until(self, target_date_str):
         """Calculate days until a future date"""
         try:
-            # Parse date
-            formats = [
-                '%Y-%m-%d',
-                '%m/%d/%Y',
-                '%B %d, %Y',
-                '%b %d, %Y',
-                '%B %d',      # December 25 (assumes current year)
-                '%b %d',      # Dec 25
-            ]
-
-            target_date = None
-            for fmt in formats:
-                try:
-                    target_date = datetime.strptime(target_date_str, fmt)
-                    # If no year specified, assume current year or next year
-                    if target_date.year == 1900:  # Default year from strptime
-                        target_date = target_date.replace(year=datetime.now().year)
-                        if target_date < datetime.now():
-                            target_date = target_date.replace(year=datetime.now().year + 1)
-                    break
-                except ValueError:
-                    continue
-
+            target_date = _parse_date(target_date_str, _COUNTDOWN_FORMATS)
             if not target_date:
                 return f"Couldn't parse date '{target_date_str}'"
 
             today = datetime.now()
+
+            # If no year specified, assume current year or next year
+            if target_date.year == 1900:  # Default year from strptime
+                target_date = target_date.replace(year=today.year)
+                if target_date < today:
+                    target_date = target_date.replace(year=today.year + 1)
+
             days_diff = (target_date - today).days
 
             if days_diff < 0:
@@ -136,23 +202,8 @@ class QuickToolsManager:
     def days_between(self, date1_str, date2_str):
         """Calculate days between two dates"""
         try:
-            formats = ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y']
-
-            date1 = None
-            date2 = None
-
-            for fmt in formats:
-                try:
-                    if not date1:
-                        date1 = datetime.strptime(date1_str, fmt)
-                except ValueError:
-                    pass
-
-                try:
-                    if not date2:
-                        date2 = datetime.strptime(date2_str, fmt)
-                except ValueError:
-                    pass
+            date1 = _parse_date(date1_str, _DATE_FORMATS)
+            date2 = _parse_date(date2_str, _DATE_FORMATS)
 
             if not date1 or not date2:
                 return "Couldn't parse dates"
@@ -184,7 +235,7 @@ class QuickToolsManager:
             if count < 1 or count > 10:
                 return "You can roll 1 to 10 dice at a time"
 
-            rolls = [random.randint(1, sides) for _ in range(count)]
+            rolls = random.choices(range(1, sides + 1), k=count)
             total = sum(rolls)
 
             if count == 1:
@@ -297,8 +348,7 @@ class QuickToolsManager:
             if p < 0 or r < 0 or t < 0:
                 return "Values must be positive"
 
-            # A = P(1 + r)^t
-            amount = p * ((1 + r) ** t)
+            amount = _compound(p, r, t)
             interest = amount - p
 
             result = f"After {t} years at {rate}% annual rate: "
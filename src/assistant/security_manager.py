@@ -7,6 +7,8 @@ import logging
 import os
 from pathlib import Path
 
+from assistant.json_files import save_json_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,8 @@ class SecurityManager:
         """Initialize security manager"""
         self.memory_dir = Path(memory_dir)
         self.security_file = self.memory_dir / 'security_settings.json'
+        # Assistant history, context and preferences (see AIAssistant)
+        self.state_file = self.memory_dir / 'state.json'
 
         # Load settings
         self.settings = self._load_settings()
@@ -42,28 +46,25 @@ class SecurityManager:
     def _save_settings(self):
         """Save security settings"""
         try:
-            with open(self.security_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            save_json_file(self.security_file, self.settings)
         except Exception as e:
             logger.error(f"Error saving security settings: {e}")
 
     def clear_conversation_history(self):
         """Clear conversation history"""
         try:
-            history_file = self.memory_dir / 'conversation_memory.json'
+            if self.state_file.exists():
+                raw = self.state_file.read_bytes()
 
-            if history_file.exists():
-                # Backup before clearing
+                # Backup before clearing: the state file's bytes, copied as-is
                 backup_file = self.memory_dir / 'conversation_memory_backup.json'
-                if history_file.exists():
-                    with open(history_file, 'r') as f:
-                        data = json.load(f)
-                    with open(backup_file, 'w') as f:
-                        json.dump(data, f, indent=2)
+                backup_file.write_bytes(raw)
+
+                state = json.loads(raw)
 
-                # Clear
-                with open(history_file, 'w') as f:
-                    json.dump([], f)
+                # Clear history, keeping context and preferences
+                state['history'] = []
+                save_json_file(self.state_file, state)
 
                 logger.info("Conversation history cleared")
                 return "Conversation history cleared. Backup saved."
@@ -79,17 +80,16 @@ class SecurityManager:
         try:
             cleared_items = []
 
-            # Clear conversation history
-            history_file = self.memory_dir / 'conversation_memory.json'
-            if history_file.exists():
-                os.remove(history_file)
-                cleared_items.append("conversation history")
+            # Clear conversation history and preferences
+            if self.state_file.exists():
+                os.remove(self.state_file)
+                cleared_items.append("conversation history and preferences")
 
-            # Clear preferences
-            prefs_file = self.memory_dir / 'user_preferences.json'
-            if prefs_file.exists():
-                os.remove(prefs_file)
-                cleared_items.append("preferences")
+            # Files from before state.json
+            for legacy_name in ('conversation_memory.json', 'user_preferences.json'):
+                legacy_file = self.memory_dir / legacy_name
+                if legacy_file.exists():
+                    os.remove(legacy_file)
 
             # Clear productivity data
             productivity_dir = self.memory_dir / 'productivity'
@@ -159,11 +159,10 @@ class SecurityManager:
             items = []
 
             # Check conversation history
-            history_file = self.memory_dir / 'conversation_memory.json'
-            if history_file.exists():
+            if self.state_file.exists():
                 try:
-                    with open(history_file, 'r') as f:
-                        history = json.load(f)
+                    with open(self.state_file, 'r') as f:
+                        history = json.load(f).get('history', [])
                     if history:
                         items.append(f"{len(history)} conversation messages")
                 except:
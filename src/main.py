@@ -365,6 +365,8 @@ class SmartGlasses:
         if hasattr(self, 'hud_overlay'):
             logger.info("Cleaning up HUD display...")
             self.hud_overlay.cleanup()
+        if hasattr(self, 'ai_assistant'):
+            self.ai_assistant.cleanup()
 
         logger.info("Smart Glasses stopped")
 
@@ -0,0 +1,103 @@
+"""Tests for AIAssistant state persistence and the pre-state.json migration"""
+
+import json
+
+import pytest
+
+from assistant.ai_assistant import AIAssistant
+
+
+HISTORY = [{'role': 'user', 'content': f'message {i}'} for i in range(12)]
+
+
+@pytest.fixture
+def memory_dir(tmp_path, monkeypatch):
+    # No API key needed; the provider client is only created on first use
+    monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+    path = tmp_path / 'memory'
+    path.mkdir()
+    return path
+
+
+def make_assistant(memory_dir):
+    return AIAssistant({'memory_directory': str(memory_dir)})
+
+
+def write_legacy_files(memory_dir):
+    (memory_dir / 'conversation_memory.json').write_text(json.dumps({
+        'history': HISTORY,
+        'context': {'location': 'Home', 'user_name': 'Sam'},
+    }))
+    (memory_dir / 'user_preferences.json').write_text(json.dumps({'name': 'Sam'}))
+
+
+def test_fresh_start_writes_nothing(memory_dir):
+    assistant = make_assistant(memory_dir)
+    assert not assistant.conversation_history
+    assistant.cleanup()
+    assert not (memory_dir / 'state.json').exists()
+
+
+def test_legacy_files_are_loaded(memory_dir):
+    write_legacy_files(memory_dir)
+    assistant = make_assistant(memory_dir)
+
+    # Only the last session's worth of history is kept
+    assert list(assistant.conversation_history) == HISTORY[-10:]
+    assert assistant.session_context['location'] == 'Home'
+    assert assistant.user_preferences == {'name': 'Sam'}
+    assistant.cleanup()
+
+
+def test_legacy_files_migrate_to_state_file(memory_dir):
+    write_legacy_files(memory_dir)
+    make_assistant(memory_dir).cleanup()
+
+    data = json.loads((memory_dir / 'state.json').read_text())
+    assert data['history'] == HISTORY[-10:]
+    assert data['context']['user_name'] == 'Sam'
+    assert data['preferences'] == {'name': 'Sam'}
+    assert 'last_updated' in data
+
+
+def test_preferences_only_legacy_file(memory_dir):
+    (memory_dir / 'user_preferences.json').write_text(json.dumps({'name': 'Sam'}))
+    make_assistant(memory_dir).cleanup()
+
+    data = json.loads((memory_dir / 'state.json').read_text())
+    assert data['preferences'] == {'name': 'Sam'}
+    assert data['history'] == []
+
+
+def test_state_file_takes_precedence(memory_dir):
+    write_legacy_files(memory_dir)
+    (memory_dir / 'state.json').write_text(json.dumps({
+        'history': [{'role': 'user', 'content': 'newer'}],
+        'context': {},
+        'preferences': {'name': 'Alex'},
+    }))
+    assistant = make_assistant(memory_dir)
+
+    assert list(assistant.conversation_history) == [{'role': 'user', 'content': 'newer'}]
+    assert assistant.user_preferences == {'name': 'Alex'}
+    assistant.cleanup()
+
+
+def test_state_round_trips(memory_dir):
+    assistant = make_assistant(memory_dir)
+    assistant._append_history('user', 'hello')
+    assistant.set_user_name('Sam')
+    assistant.cleanup()
+
+    reloaded = make_assistant(memory_dir)
+    assert list(reloaded.conversation_history) == [{'role': 'user', 'content': 'hello'}]
+    assert reloaded.user_preferences['name'] == 'Sam'
+    reloaded.cleanup()
+
+
+def test_corrupt_state_file_starts_empty(memory_dir):
+    (memory_dir / 'state.json').write_text('{not json')
+    assistant = make_assistant(memory_dir)
+    assert not assistant.conversation_history
+    assert assistant.user_preferences == {}
+    assistant.cleanup()
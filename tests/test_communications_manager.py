@@ -0,0 +1,98 @@
+"""Tests for contact lookup and deletion in CommunicationsManager"""
+
+import json
+
+import pytest
+
+from assistant import communications_manager
+from assistant.communications_manager import CommunicationsManager
+
+
+CONTACTS = {
+    'bob smith': {'name': 'Bob Smith', 'phone': '555-0100', 'email': None},
+    'alice': {'name': 'Alice', 'phone': '555-0101', 'email': 'alice@example.com'},
+    'robert': {'name': 'Robert', 'phone': '555-0102', 'email': None},
+}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager over a contacts file written before it starts, as after a restart"""
+    (tmp_path / 'contacts.json').write_text(json.dumps(CONTACTS))
+    return CommunicationsManager(data_dir=str(tmp_path))
+
+
+@pytest.fixture(params=[False, True], ids=['substring', 'rapidfuzz-flag'])
+def any_matcher(request, monkeypatch):
+    """Run a test with and without the rapidfuzz fallback switched on"""
+    if request.param and not communications_manager.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(communications_manager, 'RAPIDFUZZ_AVAILABLE', request.param)
+
+
+def test_find_contact_exact_match(manager):
+    assert manager._find_contact('alice') == ('alice', CONTACTS['alice'])
+
+
+def test_find_contact_is_case_insensitive(manager):
+    _, contact = manager._find_contact('ALICE'.casefold())
+    assert contact['name'] == 'Alice'
+
+
+def test_find_contact_prefix_match(manager):
+    assert manager._find_contact('rob')[0] == 'robert'
+
+
+def test_find_contact_substring_match(manager, any_matcher):
+    # Not a prefix of any name, so this comes from the substring scan
+    assert manager._find_contact('smith')[0] == 'bob smith'
+
+
+def test_find_contact_query_containing_a_name(manager, any_matcher):
+    assert manager._find_contact('call alice now')[0] == 'alice'
+
+
+def test_find_contact_exact_only(manager):
+    assert manager._find_contact('rob', partial=False) == (None, None)
+
+
+def test_find_contact_missing(manager, any_matcher):
+    assert manager._find_contact('zed') == (None, None)
+
+
+def test_get_contact_flags_partial_matches(manager):
+    assert manager.get_contact('Alice').startswith('Alice')
+    assert manager.get_contact('ali').startswith('Found: Alice')
+
+
+def test_delete_contact_before_index_is_built(manager):
+    # Nothing has touched the sorted index yet on a fresh start
+    assert '_contact_index' not in manager.__dict__
+
+    assert manager.delete_contact('Alice') == 'Deleted contact: Alice'
+    assert 'alice' not in manager.contacts
+    assert manager._contact_index == ['bob smith', 'robert']
+
+
+def test_delete_contact_after_lookup(manager):
+    manager._find_contact('rob')
+    manager.delete_contact('robert')
+    assert manager._find_contact('rob') == (None, None)
+    assert manager._contact_index == ['alice', 'bob smith']
+
+
+def test_delete_contact_missing(manager):
+    assert manager.delete_contact('Zed') == 'Contact not found: Zed'
+    assert len(manager.contacts) == 3
+
+
+def test_deleted_contact_stays_deleted_on_disk(manager, tmp_path):
+    manager.delete_contact('Bob Smith')
+    reloaded = CommunicationsManager(data_dir=str(tmp_path))
+    assert 'bob smith' not in reloaded.contacts
+
+
+def test_add_contact_keeps_index_sorted(manager):
+    manager.add_contact('Carol', '555-0103')
+    assert manager._contact_index == sorted(manager.contacts)
+    assert manager._find_contact('car')[0] == 'carol'
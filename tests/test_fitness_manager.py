@@ -0,0 +1,115 @@
+"""Tests for loading, migrating and indexing FitnessManager's saved data"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from assistant.fitness_manager import FitnessManager
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return tmp_path / 'fitness'
+
+
+def write_json(data_dir, name, data):
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / name).write_text(json.dumps(data))
+
+
+def test_water_log_legacy_entries_are_converted(data_dir):
+    write_json(data_dir, 'water_log.json', [
+        {'date': '2024-03-01T08:00:00', 'ounces': 8},
+        {'date': '2024-03-01T12:00:00'},
+    ])
+    manager = FitnessManager(data_dir=str(data_dir))
+
+    ts = int(datetime(2024, 3, 1, 8).timestamp())
+    assert manager.water_log == [
+        {'ts': ts, 'oz': 8.0},
+        {'ts': ts + 4 * 3600, 'oz': 0.0},
+    ]
+
+
+def test_water_log_bad_entries_are_dropped(data_dir):
+    write_json(data_dir, 'water_log.json', [
+        {'date': 'yesterday', 'ounces': 8},
+        {'date': None},
+        {'date': '2024-03-01T08:00:00', 'ounces': 'lots'},
+        'not an entry',
+        None,
+        {'date': '2024-03-01T09:00:00', 'ounces': 12},
+    ])
+    manager = FitnessManager(data_dir=str(data_dir))
+
+    assert manager.water_log == [
+        {'ts': int(datetime(2024, 3, 1, 9).timestamp()), 'oz': 12.0},
+    ]
+
+
+def test_water_log_new_format_is_kept(data_dir):
+    entries = [{'ts': 1700000000, 'oz': 8.0}, {'ts': 1700003600, 'oz': 16.0}]
+    write_json(data_dir, 'water_log.json', entries)
+    manager = FitnessManager(data_dir=str(data_dir))
+
+    assert manager.water_log == entries
+    # Nothing to migrate, so nothing is queued for writing
+    assert not manager._pending_writes
+
+
+def test_water_log_migration_is_saved(data_dir):
+    write_json(data_dir, 'water_log.json', [
+        {'date': '2024-03-01T08:00:00', 'ounces': 8},
+        {'date': 'garbage'},
+    ])
+    FitnessManager(data_dir=str(data_dir)).flush()
+
+    saved = json.loads((data_dir / 'water_log.json').read_text())
+    assert saved == [{'ts': int(datetime(2024, 3, 1, 8).timestamp()), 'oz': 8.0}]
+
+
+def test_logged_water_counts_towards_today(data_dir):
+    manager = FitnessManager(data_dir=str(data_dir))
+    manager.log_water(8)
+    manager.log_water('4.5')
+    assert manager.get_today_water_total() == 12.5
+
+
+def test_workouts_are_indexed_by_day(data_dir):
+    write_json(data_dir, 'fitness_data.json', {'workout_history': [
+        {'type': 'run', 'date': '2024-03-02T07:00:00', 'duration_minutes': 30},
+        {'type': 'yoga', 'date': '2024-03-01T18:00:00', 'duration_minutes': 45},
+        {'type': 'swim', 'date': '2024-03-02T19:00:00', 'duration_minutes': 20},
+    ]})
+    manager = FitnessManager(data_dir=str(data_dir))
+
+    first, second = datetime(2024, 3, 1).date(), datetime(2024, 3, 2).date()
+    assert manager._workout_days == [first, second]
+    assert [w['type'] for w in manager._workouts_by_day[second]] == ['run', 'swim']
+
+
+def test_workouts_with_bad_dates_are_dropped(data_dir):
+    write_json(data_dir, 'fitness_data.json', {'workout_history': [
+        {'type': 'run', 'date': 'last tuesday', 'duration_minutes': 30},
+        {'type': 'yoga', 'duration_minutes': 45},
+        {'type': 'bike', 'date': None, 'duration_minutes': 60},
+        {'type': 'swim', 'date': '2024-03-02T19:00:00', 'duration_minutes': 20},
+    ]})
+    manager = FitnessManager(data_dir=str(data_dir))
+
+    history = manager.fitness_data['workout_history']
+    assert [w['type'] for w in history] == ['swim']
+    assert manager._workout_days == [datetime(2024, 3, 2).date()]
+
+
+def test_workout_summary_counts_recent_workouts(data_dir):
+    manager = FitnessManager(data_dir=str(data_dir))
+    manager.start_workout('run')
+    manager.end_workout()
+
+    assert manager.get_workout_summary(days=7).startswith("Past 7 days: 1 workouts")
+    # The in-memory parsed dates are never written out
+    manager.flush()
+    saved = json.loads((data_dir / 'fitness_data.json').read_text())
+    assert all('_dt' not in w for w in saved['workout_history'])
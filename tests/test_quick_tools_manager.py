@@ -0,0 +1,83 @@
+"""Tests for the calculator and date parsing in QuickToolsManager"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from assistant.quick_tools_manager import QuickToolsManager, _parse_date, _COUNTDOWN_FORMATS
+
+
+@pytest.fixture
+def tools():
+    return QuickToolsManager()
+
+
+@pytest.mark.parametrize('expression, result', [
+    ('2 + 3 * 4', 14),
+    ('(2 + 3) * 4', 20),
+    ('7 // 2', 3),
+    ('7 % 4', 3),
+    ('1 / 4', 0.25),
+    ('2 ** 10', 1024),
+    ('-3 + -2', -5),
+    ('-2 ** 2', -4),
+    ('10 ** -2', 0.01),
+])
+def test_calculate(tools, expression, result):
+    assert tools.calculate(expression) == f"{expression} equals {result}"
+
+
+def test_calculate_strips_words(tools):
+    assert tools.calculate('what is 5 + 5') == "what is 5 + 5 equals 10"
+
+
+def test_calculate_divide_by_zero(tools):
+    assert tools.calculate('1 / 0') == "Cannot divide by zero"
+    assert tools.calculate('5 % 0') == "Cannot divide by zero"
+
+
+@pytest.mark.parametrize('expression', ['', 'hello', 'import os'])
+def test_calculate_nothing_to_evaluate(tools, expression):
+    assert tools.calculate(expression) == "Invalid calculation expression"
+
+
+@pytest.mark.parametrize('expression', ['2 +', '(1 + 2', '3 ** * 2'])
+def test_calculate_malformed(tools, expression):
+    assert tools.calculate(expression).startswith("Couldn't calculate")
+
+
+@pytest.mark.parametrize('expression', [
+    '9 ** 9 ** 9',
+    '((9 ** 999) ** 999) ** 999',
+    '10 ** 1001',
+    '(-10) ** 2001',
+])
+def test_calculate_rejects_huge_powers_quickly(tools, expression):
+    start = time.perf_counter()
+    assert tools.calculate(expression).startswith("Couldn't calculate")
+    assert time.perf_counter() - start < 1
+
+
+def test_calculate_allows_tiny_powers(tools):
+    assert tools.calculate('10 ** -5000') == "10 ** -5000 equals 0.0"
+    assert tools.calculate('0.5 ** 5000') == "0.5 ** 5000 equals 0.0"
+
+
+def test_calculate_power_at_the_limit(tools):
+    assert tools.calculate('10 ** 999') == f"10 ** 999 equals {10 ** 999}"
+
+
+def test_parse_date_drops_utc_offset():
+    parsed = _parse_date('2030-01-15T09:30:00+05:00', _COUNTDOWN_FORMATS)
+    assert parsed == datetime(2030, 1, 15, 9, 30)
+    assert parsed.tzinfo is None
+
+
+def test_days_until_accepts_offset_dates(tools):
+    assert tools.days_until('2000-01-15T00:00:00+00:00').endswith('days ago')
+
+
+def test_parse_date_fallback_formats():
+    assert _parse_date('Dec 25', _COUNTDOWN_FORMATS) == datetime(1900, 12, 25)
+    assert _parse_date('not a date', _COUNTDOWN_FORMATS) is None